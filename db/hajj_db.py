@@ -1,117 +1,283 @@
 import sqlite3
 import json
+import threading
+
+# orjson parses/serializes JSON several times faster than the stdlib,
+# which matters here because every record read decodes two JSON columns.
+try:
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps(obj):
+        return orjson.dumps(obj).decode('utf-8')
+except ImportError:
+    _loads = json.loads
+    _dumps = json.dumps
 
 DB_PATH = "local.db"
 
+# Shared connection used by the module's own helpers. Opening a fresh
+# connection per call paid the open(2) + WAL header read + statement-cache
+# wipe every time; one long-lived handle amortizes all of that. The lock
+# serializes access since sqlite3 connections are not thread-safe.
+_shared_conn = None
+_conn_lock = threading.Lock()
+
+# Monotonic token bumped on every write through this module, letting
+# callers cache query results and reload only when the data changed.
+_data_version = 0
+
+
+def get_data_version():
+    """Return a token that changes whenever records are created or updated."""
+    return _data_version
+
+
+def _bump_data_version():
+    global _data_version
+    _data_version += 1
+
 
 def get_connection():
-    conn = sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, cached_statements=128)
     conn.row_factory = sqlite3.Row
+
+    # WAL lets readers proceed while a writer commits, synchronous=NORMAL
+    # halves fsync traffic, and busy_timeout avoids spurious
+    # "database is locked" errors when enrollment and logging overlap.
+    conn.executescript("""
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=NORMAL;
+        PRAGMA busy_timeout=5000;
+        PRAGMA temp_store=MEMORY;
+        PRAGMA cache_size=-65536;
+        PRAGMA mmap_size=268435456;
+    """)
     return conn
 
 
+def _get_shared_connection():
+    """Return the long-lived module connection, opening it on first use."""
+    global _shared_conn
+    if _shared_conn is None:
+        _shared_conn = get_connection()
+    return _shared_conn
+
+
 def init_db():
     conn = get_connection()
     c = conn.cursor()
 
-    # Main Hajj table
+    # Main Hajj table. The bulky fingerprint payloads live in dedicated
+    # BLOB columns: storing them hex-encoded inside the JSON column doubled
+    # their size and forced a JSON parse over megabytes on every read.
     c.execute("""
     CREATE TABLE IF NOT EXISTS hajj_records (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         hajj_id TEXT UNIQUE,
         name TEXT,
         nfc_data TEXT,  -- JSON: {uid, encrypted_data, decrypted_data}
-        fingerprint_data TEXT  -- JSON: {location, template, raw_image, timestamp}
+        fingerprint_data TEXT,  -- JSON: {location, timestamp}
+        fingerprint_template BLOB,
+        fingerprint_raw_image BLOB
     )
     """)
 
+    # Migrate older databases created before the BLOB columns existed.
+    existing_cols = {row[1] for row in c.execute("PRAGMA table_info(hajj_records)")}
+    for column in ("fingerprint_template", "fingerprint_raw_image"):
+        if column not in existing_cols:
+            c.execute(f"ALTER TABLE hajj_records ADD COLUMN {column} BLOB")
+
+    # Expression index so fingerprint-location lookups are an index probe
+    # instead of a full-table scan with a JSON decode per row.
+    c.execute("""
+    CREATE INDEX IF NOT EXISTS idx_fp_loc
+    ON hajj_records(json_extract(fingerprint_data, '$.location'))
+    """)
+
     conn.commit()
     conn.close()
+    # init_db also runs after a reset drops the table, so treat it as a write.
+    _bump_data_version()
 
 
-def create_hajj_record(data):
-    conn = get_connection()
-    c = conn.cursor()
+def _as_blob(value):
+    """Normalize a template/raw-image value (bytes or legacy hex str) to bytes."""
+    if value is None:
+        return None
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value)
+    return bytes.fromhex(value)
 
-    nfc_data = json.dumps(data.get('nfc_data', {})) if data.get('nfc_data') else None
-    fp_data = json.dumps(data.get('fingerprint_data', {})) if data.get('fingerprint_data') else None
 
-    c.execute("""
-    INSERT INTO hajj_records (hajj_id, name, nfc_data, fingerprint_data)
-    VALUES (?, ?, ?, ?)
-    """, (data['hajj_id'], data['name'], nfc_data, fp_data))
+def _split_fingerprint_data(fingerprint_data):
+    """
+    Separate the heavy binary payloads from the JSON-serializable metadata.
 
-    conn.commit()
-    record_id = c.lastrowid
+    Returns (meta_dict_or_None, template_blob, raw_image_blob).
+    """
+    if not fingerprint_data:
+        return None, None, None
+
+    meta = dict(fingerprint_data)
+    template = _as_blob(meta.pop('template', None))
+    raw_image = _as_blob(meta.pop('raw_image', None))
+    return meta, template, raw_image
 
-    c.execute("SELECT * FROM hajj_records WHERE id = ?", (record_id,))
-    record = c.fetchone()
-    conn.close()
 
+def create_hajj_record(data):
+    nfc_data = _dumps(data.get('nfc_data', {})) if data.get('nfc_data') else None
+    fp_meta, fp_template, fp_raw = _split_fingerprint_data(data.get('fingerprint_data'))
+    fp_data = _dumps(fp_meta) if fp_meta else None
+
+    with _conn_lock:
+        conn = _get_shared_connection()
+        c = conn.cursor()
+        c.execute("""
+        INSERT INTO hajj_records (hajj_id, name, nfc_data, fingerprint_data,
+                                  fingerprint_template, fingerprint_raw_image)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """, (data['hajj_id'], data['name'], nfc_data, fp_data, fp_template, fp_raw))
+
+        conn.commit()
+        record_id = c.lastrowid
+
+        c.execute("SELECT * FROM hajj_records WHERE id = ?", (record_id,))
+        record = c.fetchone()
+
+    _bump_data_version()
     return _convert_record(record) if record else None
 
 
+# Single fixed upsert statement shared by every update: json_patch merges
+# the JSON columns inside SQLite instead of the old SELECT / decode /
+# merge / UPDATE / SELECT sequence, RETURNING hands back the updated row,
+# and using one constant string lets sqlite3's statement cache reuse the
+# parsed plan instead of re-parsing per-call dynamic SQL.
+_UPSERT_SQL = """
+INSERT INTO hajj_records (hajj_id, name, nfc_data, fingerprint_data,
+                          fingerprint_template, fingerprint_raw_image)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT(hajj_id) DO UPDATE SET
+    name = COALESCE(excluded.name, name),
+    nfc_data = CASE WHEN excluded.nfc_data IS NULL THEN nfc_data
+               ELSE json_patch(COALESCE(nfc_data, '{}'), excluded.nfc_data) END,
+    fingerprint_data = CASE WHEN excluded.fingerprint_data IS NULL THEN fingerprint_data
+               ELSE json_patch(COALESCE(fingerprint_data, '{}'), excluded.fingerprint_data) END,
+    fingerprint_template = COALESCE(excluded.fingerprint_template, fingerprint_template),
+    fingerprint_raw_image = COALESCE(excluded.fingerprint_raw_image, fingerprint_raw_image)
+RETURNING *
+"""
+
+
 def update_hajj_record(hajj_id, new_data):
-    conn = get_connection()
-    c = conn.cursor()
+    nfc_patch = _dumps(new_data['nfc_data']) if new_data.get('nfc_data') else None
+    fp_meta, fp_template, fp_raw = _split_fingerprint_data(new_data.get('fingerprint_data'))
+    fp_patch = _dumps(fp_meta) if fp_meta else None
 
-    # Get existing record
-    c.execute("SELECT * FROM hajj_records WHERE hajj_id = ?", (hajj_id,))
-    existing = c.fetchone()
+    with _conn_lock:
+        conn = _get_shared_connection()
+        c = conn.cursor()
+        c.execute(_UPSERT_SQL, (hajj_id, new_data.get('name'), nfc_patch, fp_patch, fp_template, fp_raw))
+        record = c.fetchone()
+        conn.commit()
+
+    _bump_data_version()
+    return _convert_record(record) if record else None
 
-    if existing:
-        updates = {}
-        if 'name' in new_data:
-            updates['name'] = new_data['name']
 
-        if 'nfc_data' in new_data:
-            current_nfc = json.loads(existing['nfc_data']) if existing['nfc_data'] else {}
-            current_nfc.update(new_data['nfc_data'])
-            updates['nfc_data'] = json.dumps(current_nfc)
+def get_hajj_by_fp_location(location):
+    """Look up the hajj_id whose fingerprint is stored at the given location."""
+    with _conn_lock:
+        c = _get_shared_connection().cursor()
+        c.execute("""
+        SELECT hajj_id FROM hajj_records
+        WHERE json_extract(fingerprint_data, '$.location') = ?
+        """, (str(location),))
+        row = c.fetchone()
+    return row['hajj_id'] if row else None
 
-        if 'fingerprint_data' in new_data:
-            current_fp = json.loads(existing['fingerprint_data']) if existing['fingerprint_data'] else {}
-            current_fp.update(new_data['fingerprint_data'])
-            updates['fingerprint_data'] = json.dumps(current_fp)
 
-        if updates:
-            query = "UPDATE hajj_records SET " + ", ".join(f"{k} = ?" for k in updates)
-            query += " WHERE hajj_id = ?"
-            c.execute(query, list(updates.values()) + [hajj_id])
-            conn.commit()
+def get_hajj_record_by_fp_location(location):
+    """
+    Fetch the full record whose fingerprint is stored at the given location.
 
-        c.execute("SELECT * FROM hajj_records WHERE hajj_id = ?", (hajj_id,))
+    The expression index on json_extract(fingerprint_data, '$.location')
+    makes this a B-tree seek instead of a full-table scan.
+    """
+    with _conn_lock:
+        c = _get_shared_connection().cursor()
+        c.execute("""
+        SELECT * FROM hajj_records
+        WHERE json_extract(fingerprint_data, '$.location') = ?
+        """, (str(location),))
         record = c.fetchone()
-        conn.close()
-        return _convert_record(record) if record else None
-    else:
-        conn.close()
-        return create_hajj_record({
-            'hajj_id': hajj_id,
-            'name': new_data.get('name'),
-            'nfc_data': new_data.get('nfc_data'),
-            'fingerprint_data': new_data.get('fingerprint_data')
-        })
+    return _convert_record(record) if record else None
+
+
+def get_hajj_records_summary():
+    """
+    Lightweight listing of hajj_id, name, NFC uid and fingerprint location.
+
+    Selecting only these fields keeps the multi-KB fingerprint blobs inside
+    SQLite instead of transferring and parsing them just to print a list.
+    """
+    with _conn_lock:
+        c = _get_shared_connection().cursor()
+        c.execute("""
+        SELECT hajj_id, name,
+               json_extract(nfc_data, '$.uid') AS uid,
+               json_extract(fingerprint_data, '$.location') AS location
+        FROM hajj_records
+        """)
+        rows = c.fetchall()
+    return [dict(row) for row in rows]
 
 
 def get_hajj_records():
-    conn = get_connection()
-    c = conn.cursor()
-    c.execute("SELECT * FROM hajj_records")
-    records = c.fetchall()
-    conn.close()
+    with _conn_lock:
+        c = _get_shared_connection().cursor()
+        c.execute("SELECT * FROM hajj_records")
+        records = c.fetchall()
     return [_convert_record(record) for record in records]
 
 
+# hajj_id -> record index cached against the data version token, so a
+# name lookup is one dict hit instead of a linear scan of the table.
+_by_id_cache = {}
+_by_id_version = None
+
+
+def get_hajj_record_by_id(hajj_id):
+    """Return the full record for one hajj_id, or None if unknown."""
+    global _by_id_cache, _by_id_version
+    if _by_id_version != _data_version:
+        _by_id_cache = {r['hajj_id']: r for r in get_hajj_records()}
+        _by_id_version = _data_version
+    return _by_id_cache.get(hajj_id)
+
+
 def _convert_record(record):
     if not record:
         return None
 
     result = dict(record)
     if result.get('nfc_data'):
-        result['nfc_data'] = json.loads(result['nfc_data'])
+        result['nfc_data'] = _loads(result['nfc_data'])
     if result.get('fingerprint_data'):
-        result['fingerprint_data'] = json.loads(result['fingerprint_data'])
+        result['fingerprint_data'] = _loads(result['fingerprint_data'])
+
+    # Fold the BLOB columns back into the fingerprint_data dict so callers
+    # keep seeing the same shape, now with raw bytes instead of hex text.
+    template = result.pop('fingerprint_template', None)
+    raw_image = result.pop('fingerprint_raw_image', None)
+    if template is not None or raw_image is not None:
+        fp = result.get('fingerprint_data') or {}
+        fp['template'] = template
+        fp['raw_image'] = raw_image
+        result['fingerprint_data'] = fp
     return result
 
 
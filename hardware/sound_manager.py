@@ -1,10 +1,19 @@
 # sound_manager.py
 
 import gpiod
+import queue
+import threading
 import time
 import logging
 from typing import Optional
 
+# pigpio drives the BCM hardware PWM peripheral, so tones cost no CPU;
+# the gpiod software loop remains as a fallback when the daemon is absent.
+try:
+    import pigpio
+except ImportError:
+    pigpio = None
+
 logger = logging.getLogger(__name__)
 
 class SoundManager:
@@ -15,10 +24,45 @@ class SoundManager:
     FAIL_HIGH_FREQ = 800
     FAIL_LOW_FREQ = 600
 
+    # (high_time, low_time) per tone frequency at the default 50% duty
+    # cycle, computed once at class load instead of per tone.
+    _TONES = {
+        freq: (0.5 / freq, 0.5 / freq)
+        for freq in (SUCCESS_HIGH_FREQ, SUCCESS_LOW_FREQ, FAIL_HIGH_FREQ, FAIL_LOW_FREQ)
+    }
+
+    # (frequency, duration, post_gap) steps per pattern, fixed at class
+    # load so play calls do no per-invocation assembly.
+    _PATTERNS = {
+        'success': ((SUCCESS_LOW_FREQ, 0.06, 0.02), (SUCCESS_HIGH_FREQ, 0.08, 0.0)),
+        'fail': ((FAIL_HIGH_FREQ, 0.1, 0.02), (FAIL_LOW_FREQ, 0.15, 0.0)),
+    }
+
     def __init__(self):
-        """Initialize GPIO for sound output."""
+        """Initialize hardware PWM (preferred) or GPIO for sound output."""
         self.chip: Optional[gpiod.Chip] = None
         self.line: Optional[gpiod.Line] = None
+        self.pi = None
+
+        # Playback runs on a dedicated daemon thread so play_success and
+        # play_fail return immediately instead of holding the caller (the
+        # UI thread during verification) for the whole tone duration. The
+        # tiny bounded queue drops requests while a pattern is playing so
+        # rapid scans don't pile up beeps.
+        self._pattern_queue: queue.Queue = queue.Queue(maxsize=2)
+        self._player = threading.Thread(target=self._pattern_worker, daemon=True)
+        self._player.start()
+
+        if pigpio is not None:
+            try:
+                pi = pigpio.pi()
+                if pi.connected:
+                    self.pi = pi
+                    logger.info("Sound manager initialized with hardware PWM")
+                    return
+            except Exception as e:
+                logger.warning(f"pigpio unavailable, falling back to software PWM: {e}")
+
         try:
             self.chip = gpiod.Chip("gpiochip0")
             self.line = self.chip.get_line(self.PWM_GPIO_OFFSET)
@@ -30,51 +74,87 @@ class SoundManager:
 
     def _play_tone(self, frequency: int, duration: float, duty_cycle: float = 0.5) -> None:
         """Generate a tone using PWM."""
+        if self.pi is not None:
+            # Hardware PWM: the peripheral generates the waveform while we
+            # just sleep for the tone duration — no per-edge CPU work.
+            try:
+                self.pi.hardware_PWM(
+                    self.PWM_GPIO_OFFSET, int(frequency), int(duty_cycle * 1_000_000))
+                time.sleep(duration)
+                self.pi.hardware_PWM(self.PWM_GPIO_OFFSET, 0, 0)
+            except Exception as e:
+                logger.error(f"Error playing tone: {e}")
+            return
+
         if not self.line:
             logger.warning("Cannot play tone: GPIO line not initialized")
             return
 
         try:
-            period = 1.0 / frequency
-            high_time = period * duty_cycle
-            low_time = period * (1 - duty_cycle)
-            end_time = time.time() + duration
-
-            while time.time() < end_time:
-                self.line.set_value(1)
-                time.sleep(high_time)
-                self.line.set_value(0)
-                time.sleep(low_time)
+            if duty_cycle == 0.5 and frequency in self._TONES:
+                high_time, low_time = self._TONES[frequency]
+            else:
+                period = 1.0 / frequency
+                high_time = period * duty_cycle
+                low_time = period * (1 - duty_cycle)
+
+            # Bind the methods to locals: at 1800 Hz a tone runs hundreds of
+            # loop iterations, and dropping the attribute lookups from the
+            # timing loop reduces edge jitter on the software path.
+            set_value = self.line.set_value
+            sleep = time.sleep
+            now = time.time
+            end_time = now() + duration
+
+            while now() < end_time:
+                set_value(1)
+                sleep(high_time)
+                set_value(0)
+                sleep(low_time)
         except Exception as e:
             logger.error(f"Error playing tone: {e}")
 
-    def play_success(self) -> None:
-        """Play success sound pattern."""
+    def _pattern_worker(self) -> None:
+        """Daemon loop playing queued tone patterns off the caller thread."""
+        while True:
+            name = self._pattern_queue.get()
+            if name is None:
+                break
+            try:
+                for frequency, duration, gap in self._PATTERNS[name]:
+                    self._play_tone(frequency=frequency, duration=duration)
+                    if gap:
+                        time.sleep(gap)
+            except Exception as e:
+                logger.error(f"Error playing {name} sound: {e}")
+
+    def _enqueue_pattern(self, name: str) -> None:
         try:
-            logger.debug("Playing success sound")
-            # First tone (lower frequency, shorter duration)
-            self._play_tone(frequency=self.SUCCESS_LOW_FREQ, duration=0.06)
-            time.sleep(0.02)
-            # Second tone (higher frequency, slightly longer)
-            self._play_tone(frequency=self.SUCCESS_HIGH_FREQ, duration=0.08)
-        except Exception as e:
-            logger.error(f"Error playing success sound: {e}")
+            self._pattern_queue.put_nowait(name)
+        except queue.Full:
+            pass  # a pattern is already queued; skip rather than stack beeps
+
+    def play_success(self) -> None:
+        """Play success sound pattern (asynchronous)."""
+        logger.debug("Playing success sound")
+        self._enqueue_pattern('success')
 
     def play_fail(self) -> None:
-        """Play failure sound pattern."""
-        try:
-            logger.debug("Playing failure sound")
-            # First tone (higher frequency)
-            self._play_tone(frequency=self.FAIL_HIGH_FREQ, duration=0.1)
-            time.sleep(0.02)
-            # Second tone (lower frequency, longer duration)
-            self._play_tone(frequency=self.FAIL_LOW_FREQ, duration=0.15)
-        except Exception as e:
-            logger.error(f"Error playing failure sound: {e}")
+        """Play failure sound pattern (asynchronous)."""
+        logger.debug("Playing failure sound")
+        self._enqueue_pattern('fail')
 
     def cleanup(self) -> None:
-        """Clean up GPIO resources."""
+        """Clean up GPIO/PWM resources."""
         try:
+            player = getattr(self, '_player', None)
+            if player is not None and player.is_alive():
+                self._pattern_queue.put(None)
+                player.join(timeout=1)
+            if self.pi is not None:
+                self.pi.hardware_PWM(self.PWM_GPIO_OFFSET, 0, 0)
+                self.pi.stop()
+                self.pi = None
             if self.line:
                 self.line.set_value(0)
             logger.info("Sound manager cleaned up")
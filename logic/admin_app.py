@@ -1,13 +1,32 @@
 # admin_app.py
+import queue
 import sys
+import threading
+import datetime
 import time
 import tkinter as tk
 from tkinter import simpledialog, messagebox, ttk
 import os
-from db.hajj_db import get_connection, init_db, get_hajj_records, create_hajj_record, update_hajj_record
+from db.hajj_db import (get_connection, init_db, get_hajj_records,
+                        get_hajj_records_summary, get_hajj_record_by_fp_location,
+                        create_hajj_record, update_hajj_record)
 
 
 class AdminAppGUI:
+    # Admin actions (label, handler name, dangerous, row, col), built once
+    # instead of re-allocating the tuple list every time the panel opens.
+    ACTIONS = (
+        ("Add New Hajj", "_add_new_hajj", False, 0, 0),
+        ("Write NFC", "_write_nfc", False, 0, 1),
+        ("Read NFC", "_read_nfc", False, 0, 2),
+        ("Assign Fingerprint", "_assign_fingerprint", False, 1, 0),
+        ("Check Fingerprint", "_check_fingerprint", False, 1, 1),
+        ("Display Database", "_display_db", False, 1, 2),
+        ("Delete All Fingerprints", "_delete_all_fingerprints", True, 2, 0),
+        ("Reset System", "_reset_system", True, 2, 1),
+        ("Exit", "_exit_app", False, 2, 2),
+    )
+
     def __init__(self, root, logger, admin_nfc, admin_fingerprint):
         self.root = root
         self.logger = logger
@@ -15,6 +34,20 @@ class AdminAppGUI:
         self.admin_fingerprint = admin_fingerprint
         self.logged_in_username = None
 
+        # Cached snapshot of hajj_records: a single admin action (e.g. add
+        # new hajj) used to issue several identical full-table queries, each
+        # re-parsing every JSON column. Invalidated after any DB mutation.
+        self._records_cache = None
+        self._records_cache_ts = 0.0
+        # Built alongside the cache: O(1) fingerprint-location lookups and
+        # a 120-slot bitmap for next-free-location scans.
+        self._loc_index = {}
+        self._used_locations_bitmap = 0
+
+        # Long-lived connection for the GUI's own statements; opening a
+        # fresh connection per operation repaid the PRAGMA setup each time.
+        self._conn = get_connection()
+
         # Configure root window
         self.root.title("Admin Login")
         self.root.protocol("WM_DELETE_WINDOW", self._on_closing)
@@ -24,6 +57,63 @@ class AdminAppGUI:
         self.create_styles()
         self._create_login_screen()
 
+    def _get_hajj_records_cached(self, ttl=5.0):
+        """Return hajj records, reusing a snapshot fetched within ttl seconds."""
+        now = time.monotonic()
+        if self._records_cache is None or now - self._records_cache_ts > ttl:
+            self._records_cache = get_hajj_records()
+            self._records_cache_ts = now
+            self._rebuild_location_index()
+        return self._records_cache
+
+    def _rebuild_location_index(self):
+        """Index records by fingerprint location and mark used slots in a bitmap."""
+        self._loc_index = {}
+        self._used_locations_bitmap = 0
+        for record in self._records_cache:
+            fp = record.get('fingerprint_data')
+            if not fp or not fp.get('location'):
+                continue
+            try:
+                location = int(fp['location'])
+            except (ValueError, TypeError):
+                continue
+            self._loc_index[location] = record
+            if 1 <= location <= 120:
+                self._used_locations_bitmap |= 1 << location
+
+    def _invalidate_records_cache(self):
+        """Drop the cached snapshot after any database mutation."""
+        self._records_cache = None
+
+    def _run_in_thread(self, target, on_done):
+        """
+        Run target() on a worker thread and deliver (result, error) to
+        on_done back on the Tk main thread.
+
+        Sensor and DB operations block for seconds; running them inline
+        froze the whole admin UI until they finished.
+        """
+        result_queue = queue.Queue(maxsize=1)
+
+        def _worker():
+            try:
+                result_queue.put((target(), None))
+            except Exception as e:
+                result_queue.put((None, e))
+
+        threading.Thread(target=_worker, daemon=True).start()
+
+        def _poll():
+            try:
+                result, error = result_queue.get_nowait()
+            except queue.Empty:
+                self.root.after(50, _poll)
+                return
+            on_done(result, error)
+
+        self.root.after(50, _poll)
+
     def create_styles(self):
         """Define custom styles for the application."""
         style = ttk.Style()
@@ -34,6 +124,21 @@ class AdminAppGUI:
         style.configure("Danger.TButton",
                         font=("Helvetica", 12, "bold"),
                         foreground="red")
+        # Panel button styles, configured once here rather than on every
+        # _open_admin_panel call.
+        style.configure(
+            "Box.TButton",
+            padding=20,
+            width=15,
+            font=("Helvetica", 12)
+        )
+        style.configure(
+            "BoxDanger.TButton",
+            padding=20,
+            width=15,
+            font=("Helvetica", 12, "bold"),
+            foreground="red"
+        )
 
     def _create_login_screen(self):
         """Create the initial login screen."""
@@ -99,41 +204,12 @@ class AdminAppGUI:
         grid_frame = ttk.Frame(main_frame)
         grid_frame.pack(expand=True)
 
-        # Define admin actions with grid positions
-        actions = [
-            ("Add New Hajj", self._add_new_hajj, False, 0, 0),
-            ("Write NFC", self._write_nfc, False, 0, 1),
-            ("Read NFC", self._read_nfc, False, 0, 2),
-            ("Assign Fingerprint", self._assign_fingerprint, False, 1, 0),
-            ("Check Fingerprint", self._check_fingerprint, False, 1, 1),
-            ("Display Database", self._display_db, False, 1, 2),
-            ("Delete All Fingerprints", self._delete_all_fingerprints, True, 2, 0),
-            ("Reset System", self._reset_system, True, 2, 1),
-            ("Exit", self._exit_app, False, 2, 2)
-        ]
-
-        # Configure box button style
-        style = ttk.Style()
-        style.configure(
-            "Box.TButton",
-            padding=20,
-            width=15,
-            font=("Helvetica", 12)
-        )
-        style.configure(
-            "BoxDanger.TButton",
-            padding=20,
-            width=15,
-            font=("Helvetica", 12, "bold"),
-            foreground="red"
-        )
-
-        # Create box-style buttons
-        for text, command, is_dangerous, row, col in actions:
+        # Create box-style buttons from the class-level action table
+        for text, handler, is_dangerous, row, col in self.ACTIONS:
             btn = ttk.Button(
                 grid_frame,
                 text=text,
-                command=command,
+                command=getattr(self, handler),
                 style="BoxDanger.TButton" if is_dangerous else "Box.TButton"
             )
             btn.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
@@ -175,22 +251,11 @@ class AdminAppGUI:
     def get_next_available_location(self):
         """Find next available fingerprint location (1-120)."""
         try:
-            hajj_records = get_hajj_records()
-            used_locations = set()
-
-            for record in hajj_records:
-                if record.get('fingerprint_data') and record['fingerprint_data'].get('location'):
-                    try:
-                        location = int(record['fingerprint_data']['location'])
-                        if 1 <= location <= 120:
-                            used_locations.add(location)
-                    except (ValueError, TypeError):
-                        continue
-
+            self._get_hajj_records_cached()
+            bitmap = self._used_locations_bitmap
             for location in range(1, 121):
-                if location not in used_locations:
+                if not (bitmap >> location) & 1:
                     return location
-
             return None
 
         except Exception as e:
@@ -204,19 +269,36 @@ class AdminAppGUI:
 
     def _display_db(self):
         try:
-            hajj_records = get_hajj_records()
+            # Summary query: no JSON parse and no fingerprint blob transfer
+            # just to print a listing.
+            hajj_records = get_hajj_records_summary()
 
-            info = "=== Database Contents ===\n\n"
+            # Collect chunks and join once: repeated `info +=` re-copied the
+            # whole growing string per record.
+            parts = ["=== Database Contents ===\n\n"]
             for record in hajj_records:
-                info += f"Hajj ID: {record['hajj_id']}\n"
-                info += f"Name: {record['name']}\n"
-                if record.get('nfc_data'):
-                    info += f"NFC UID: {record['nfc_data'].get('uid', 'N/A')}\n"
-                if record.get('fingerprint_data'):
-                    info += f"Fingerprint Location: {record['fingerprint_data'].get('location', 'N/A')}\n"
-                info += "-------------------\n"
-
-            messagebox.showinfo("DB Contents", info)
+                parts.append(f"Hajj ID: {record['hajj_id']}\n")
+                parts.append(f"Name: {record['name']}\n")
+                if record['uid'] is not None:
+                    parts.append(f"NFC UID: {record['uid']}\n")
+                if record['location'] is not None:
+                    parts.append(f"Fingerprint Location: {record['location']}\n")
+                parts.append("-------------------\n")
+
+            # Scrollable Text window instead of a messagebox, which is slow
+            # for long strings and caps how much it displays.
+            window = tk.Toplevel(self.root)
+            window.title("DB Contents")
+            window.geometry("400x500")
+
+            text = tk.Text(window, wrap="word")
+            scrollbar = ttk.Scrollbar(window, orient="vertical", command=text.yview)
+            text.configure(yscrollcommand=scrollbar.set)
+            scrollbar.pack(side="right", fill="y")
+            text.pack(side="left", expand=True, fill="both")
+
+            text.insert("end", "".join(parts))
+            text.configure(state="disabled")
         except Exception as e:
             messagebox.showerror("DB Error", f"Failed to fetch data: {str(e)}")
 
@@ -228,24 +310,32 @@ class AdminAppGUI:
 
         try:
             # Clear database
-            conn = get_connection()
-            c = conn.cursor()
-            c.execute("DROP TABLE IF EXISTS hajj_records")
+            with self._conn:
+                self._conn.execute("DROP TABLE IF EXISTS hajj_records")
             init_db()
-            conn.close()
+            self._invalidate_records_cache()
 
-            # Clear fingerprint sensor
-            for i in range(1, 121):
-                try:
-                    self.admin_fingerprint.fingerprint_manager.delete_model(i)
-                except:
-                    continue
+            # Clear fingerprint sensor: one EmptyLibrary command instead of
+            # 120 serial round-trips, with the per-slot loop as fallback.
+            try:
+                cleared = self.admin_fingerprint.fingerprint_manager.empty_library()
+            except Exception:
+                cleared = False
+            if not cleared:
+                for i in range(1, 121):
+                    try:
+                        self.admin_fingerprint.fingerprint_manager.delete_model(i)
+                    except:
+                        continue
 
-            # Clear logs
+            # Clear logs. scandir yields entries with pre-built paths and
+            # cached type info, avoiding a stat and a path join per file.
             for log_dir in [os.path.join("logs", "admin"), os.path.join("logs", "user")]:
                 if os.path.exists(log_dir):
-                    for file in os.listdir(log_dir):
-                        os.remove(os.path.join(log_dir, file))
+                    with os.scandir(log_dir) as entries:
+                        for entry in entries:
+                            if entry.is_file():
+                                os.unlink(entry.path)
 
             messagebox.showinfo("Success", "System has been reset to factory settings")
 
@@ -274,6 +364,14 @@ class AdminAppGUI:
             if not messagebox.askyesno("Enroll Fingerprint", "Place finger on sensor for enrollment"):
                 return
 
+            # The raw image is a ~36KB transfer at 57600 baud (several
+            # seconds) and is never used for matching, so it is opt-in.
+            store_raw = messagebox.askyesno(
+                "Enroll Fingerprint",
+                "Also store the raw fingerprint image? (slow)",
+                default=messagebox.NO
+            )
+
             self.logger.log_admin(
                 self.logged_in_username,
                 "AssignFingerprint",
@@ -281,132 +379,128 @@ class AdminAppGUI:
                 "Starting fingerprint enrollment process..."
             )
 
-            success = self.admin_fingerprint.fingerprint_manager.enroll_finger(location)
+            # Enrollment blocks on the sensor for up to a minute; run it on
+            # a worker thread so the admin panel stays responsive.
+            self._run_in_thread(
+                lambda: self._enroll_fingerprint_worker(hajj_id, location, store_raw),
+                lambda result, error: self._on_assign_fingerprint_done(
+                    hajj_id, location, result, error)
+            )
+
+        except Exception as e:
+            error_msg = f"Operation failed: {str(e)}"
             self.logger.log_admin(
                 self.logged_in_username,
-                "AssignFingerprint",
-                success,
-                f"Enrollment result: {success}"
+                f"AssignFingerprint[{hajj_id}]",
+                False,
+                error_msg
             )
+            messagebox.showerror("Error", error_msg)
 
-            if success:
-                try:
-                    self.logger.log_admin(
-                        self.logged_in_username,
-                        "AssignFingerprint",
-                        True,
-                        "Attempting to get fingerprint data..."
-                    )
+    def _enroll_fingerprint_worker(self, hajj_id, location, store_raw=False):
+        """Blocking part of fingerprint assignment (runs on a worker thread)."""
+        # Step-by-step messages are buffered and emitted as one log entry
+        # in the finally block, instead of ~10 individual file writes.
+        trace = []
+        try:
+            success = self.admin_fingerprint.fingerprint_manager.enroll_finger(location)
+            trace.append((time.monotonic(), f"Enrollment result: {success}"))
 
-                    # Attempt 1: Try with raw buffer type
-                    try:
-                        raw_data = self.admin_fingerprint.fingerprint_manager.finger.get_fpdata('raw')
-                        self.logger.log_admin(
-                            self.logged_in_username,
-                            "AssignFingerprint",
-                            True,
-                            f"Raw data retrieved, type: {type(raw_data)}, length: {len(raw_data) if raw_data else 'None'}"
-                        )
-                    except Exception as e:
-                        self.logger.log_admin(
-                            self.logged_in_username,
-                            "AssignFingerprint",
-                            False,
-                            f"Error getting raw data: {str(e)}"
-                        )
-                        raw_data = None
+            if not success:
+                return False
 
-                    # Attempt 2: Try with char buffer type
-                    try:
-                        template = self.admin_fingerprint.fingerprint_manager.finger.get_fpdata('char')
-                        self.logger.log_admin(
-                            self.logged_in_username,
-                            "AssignFingerprint",
-                            True,
-                            f"Template data retrieved, type: {type(template)}, length: {len(template) if template else 'None'}"
-                        )
-                    except Exception as e:
-                        self.logger.log_admin(
-                            self.logged_in_username,
-                            "AssignFingerprint",
-                            False,
-                            f"Error getting template data: {str(e)}"
-                        )
-                        template = None
-
-                    # Attempt 3: Try without buffer type if both attempts fail
-                    if raw_data is None:
-                        try:
-                            raw_data = self.admin_fingerprint.fingerprint_manager.finger.get_fpdata()
-                            template = raw_data  # Use same data for both if this works
-                            self.logger.log_admin(
-                                self.logged_in_username,
-                                "AssignFingerprint",
-                                True,
-                                f"Generic data retrieved, type: {type(raw_data)}, length: {len(raw_data) if raw_data else 'None'}"
-                            )
-                        except Exception as e:
-                            self.logger.log_admin(
-                                self.logged_in_username,
-                                "AssignFingerprint",
-                                False,
-                                f"Error getting generic data: {str(e)}"
-                            )
-                            raise Exception("Could not retrieve fingerprint data in any format")
-
-                    fingerprint_data = {
-                        'location': str(location),
-                        'template': template.hex() if isinstance(template, bytes) else bytes(
-                            template).hex() if template else None,
-                        'raw_image': raw_data.hex() if isinstance(raw_data, bytes) else bytes(
-                            raw_data).hex() if raw_data else None,
-                        'timestamp': time.strftime("%Y-%m-%d %H:%M:%S")
-                    }
+            trace.append((time.monotonic(), "Attempting to get fingerprint data..."))
 
-                    self.logger.log_admin(
-                        self.logged_in_username,
-                        "AssignFingerprint",
-                        True,
-                        f"Fingerprint data prepared: {fingerprint_data}"
-                    )
+            # Attempt 1: Raw image, only when the admin opted in
+            raw_data = None
+            if store_raw:
+                try:
+                    raw_data = self.admin_fingerprint.fingerprint_manager.finger.get_fpdata('raw')
+                    trace.append((time.monotonic(),
+                                  f"Raw data retrieved, length: {len(raw_data) if raw_data else 'None'}"))
+                except Exception as e:
+                    trace.append((time.monotonic(), f"Error getting raw data: {e}"))
+                    raw_data = None
+
+            # Attempt 2: Try with char buffer type
+            try:
+                template = self.admin_fingerprint.fingerprint_manager.finger.get_fpdata('char')
+                trace.append((time.monotonic(),
+                              f"Template data retrieved, length: {len(template) if template else 'None'}"))
+            except Exception as e:
+                trace.append((time.monotonic(), f"Error getting template data: {e}"))
+                template = None
+
+            # Attempt 3: Try without buffer type if the template fetch failed
+            if template is None:
+                try:
+                    data = self.admin_fingerprint.fingerprint_manager.finger.get_fpdata()
+                    template = data
+                    if store_raw and raw_data is None:
+                        raw_data = data  # Use same data for both if this works
+                    trace.append((time.monotonic(),
+                                  f"Generic data retrieved, length: {len(data) if data else 'None'}"))
+                except Exception as e:
+                    trace.append((time.monotonic(), f"Error getting generic data: {e}"))
+                    raise Exception("Could not retrieve fingerprint data in any format")
+
+            # Raw bytes go straight into the dedicated BLOB columns; the
+            # old .hex() strings doubled the size and cost an encode/decode
+            # pass on every read and write. Convert each payload once and
+            # share the reference when attempt 3 reused the same buffer,
+            # instead of running two identical conversions.
+            template_bytes = None
+            if template is not None:
+                template_bytes = (template if isinstance(template, bytes)
+                                  else bytes(template))
+            if raw_data is None:
+                raw_bytes = None
+            elif raw_data is template:
+                raw_bytes = template_bytes
+            else:
+                raw_bytes = (raw_data if isinstance(raw_data, bytes)
+                             else bytes(raw_data))
+
+            fingerprint_data = {
+                'location': str(location),
+                'template': template_bytes,
+                'raw_image': raw_bytes,
+                'timestamp': datetime.datetime.now().isoformat(sep=' ', timespec='seconds')
+            }
 
-                    update_hajj_record(hajj_id, {'fingerprint_data': fingerprint_data})
-                    messagebox.showinfo("Success", f"Fingerprint enrolled for {hajj_id} at location {location}")
-                    self.logger.log_admin(
-                        self.logged_in_username,
-                        f"AssignFingerprint[{hajj_id}]",
-                        True
-                    )
+            trace.append((time.monotonic(),
+                          f"Fingerprint data prepared: location={location}, "
+                          f"template={len(fingerprint_data['template'] or b'')} bytes, "
+                          f"raw_image={len(fingerprint_data['raw_image'] or b'')} bytes"))
 
-                except Exception as inner_e:
-                    self.logger.log_admin(
-                        self.logged_in_username,
-                        "AssignFingerprint",
-                        False,
-                        f"Error during fingerprint data processing: {str(inner_e)}"
-                    )
-                    # Try to clean up if data processing failed
-                    try:
-                        self.admin_fingerprint.fingerprint_manager.delete_model(location)
-                        self.logger.log_admin(
-                            self.logged_in_username,
-                            "AssignFingerprint",
-                            True,
-                            f"Cleaned up fingerprint at location {location} after error"
-                        )
-                    except Exception as cleanup_e:
-                        self.logger.log_admin(
-                            self.logged_in_username,
-                            "AssignFingerprint",
-                            False,
-                            f"Error during cleanup: {str(cleanup_e)}"
-                        )
-                    raise inner_e
-            else:
-                messagebox.showerror("Error", "Enrollment failed")
+            update_hajj_record(hajj_id, {'fingerprint_data': fingerprint_data})
+            return True
 
-        except Exception as e:
-            error_msg = f"Operation failed: {str(e)}"
+        except Exception as inner_e:
+            trace.append((time.monotonic(),
+                          f"Error during fingerprint data processing: {inner_e}"))
+            # Try to clean up if data processing failed
+            try:
+                self.admin_fingerprint.fingerprint_manager.delete_model(location)
+                trace.append((time.monotonic(),
+                              f"Cleaned up fingerprint at location {location} after error"))
+            except Exception as cleanup_e:
+                trace.append((time.monotonic(), f"Error during cleanup: {cleanup_e}"))
+            raise inner_e
+
+        finally:
+            start = trace[0][0] if trace else 0.0
+            self.logger.log_admin(
+                self.logged_in_username,
+                f"AssignFingerprint[{hajj_id}]",
+                True,
+                "; ".join(f"+{t - start:.2f}s {msg}" for t, msg in trace)
+            )
+
+    def _on_assign_fingerprint_done(self, hajj_id, location, result, error):
+        """Report the enrollment outcome back on the Tk main thread."""
+        if error is not None:
+            error_msg = f"Operation failed: {str(error)}"
             self.logger.log_admin(
                 self.logged_in_username,
                 f"AssignFingerprint[{hajj_id}]",
@@ -414,6 +508,16 @@ class AdminAppGUI:
                 error_msg
             )
             messagebox.showerror("Error", error_msg)
+        elif result:
+            self._invalidate_records_cache()
+            messagebox.showinfo("Success", f"Fingerprint enrolled for {hajj_id} at location {location}")
+            self.logger.log_admin(
+                self.logged_in_username,
+                f"AssignFingerprint[{hajj_id}]",
+                True
+            )
+        else:
+            messagebox.showerror("Error", "Enrollment failed")
 
     def _delete_all_fingerprints(self):
         if not messagebox.askyesno("Warning", "This will delete ALL fingerprint data. Continue?"):
@@ -431,41 +535,87 @@ class AdminAppGUI:
             progress.pack(pady=5)
 
             def update_progress(i):
+                # update_idletasks flushes only pending draw work; the full
+                # update() forced a whole Tk event-loop round per call.
                 progress.config(text=f"{i}/128")
-                progress_window.update()
+                progress_window.update_idletasks()
 
-            # Delete from sensor and database
-            hajj_records = get_hajj_records()
-            for i in range(128):
-                try:
-                    self.admin_fingerprint.fingerprint_manager.delete_model(i)
-                    # Update any records with this fingerprint location
-                    for record in hajj_records:
-                        if (record.get('fingerprint_data') and
-                                record['fingerprint_data'].get('location') == str(i)):
-                            update_hajj_record(record['hajj_id'], {'fingerprint_data': None})
-                    update_progress(i + 1)
-                except:
-                    pass
+            # Location->hajj_id map computed once, instead of rescanning the
+            # full record list inside each of the 128 sensor iterations.
+            hajj_records = self._get_hajj_records_cached()
+            loc_to_hajj = {}
+            for record in hajj_records:
+                fp = record.get('fingerprint_data')
+                if fp and fp.get('location'):
+                    try:
+                        loc_to_hajj[int(fp['location'])] = record['hajj_id']
+                    except (ValueError, TypeError):
+                        continue
+
+            def worker():
+                cleared = []
+                for i in range(128):
+                    try:
+                        self.admin_fingerprint.fingerprint_manager.delete_model(i)
+                        if i in loc_to_hajj:
+                            cleared.append(loc_to_hajj[i])
+                        # Refresh the progress display every 8 iterations
+                        if (i & 7) == 0:
+                            self.root.after(0, lambda i=i: update_progress(i + 1))
+                    except:
+                        pass
+                return cleared
+
+            def on_done(cleared_ids, error):
+                progress_window.destroy()
+                if error is not None:
+                    messagebox.showerror("Error", f"Delete failed: {error}")
+                    return
+
+                # One transaction clears every matched record, instead of an
+                # individual UPDATE + commit per location.
+                if cleared_ids:
+                    placeholders = ",".join("?" * len(cleared_ids))
+                    with self._conn:
+                        self._conn.execute(
+                            "UPDATE hajj_records SET fingerprint_data=NULL, "
+                            "fingerprint_template=NULL, fingerprint_raw_image=NULL "
+                            f"WHERE hajj_id IN ({placeholders})",
+                            cleared_ids
+                        )
+
+                self._invalidate_records_cache()
+                messagebox.showinfo("Success", "All fingerprint data deleted")
 
-            progress_window.destroy()
-            messagebox.showinfo("Success", "All fingerprint data deleted")
+            # The 128 sensor deletions run off the Tk thread; progress
+            # updates are marshalled back through root.after.
+            self._run_in_thread(worker, on_done)
 
         except Exception as e:
             messagebox.showerror("Error", f"Delete failed: {str(e)}")
 
     def _check_fingerprint(self):
         """Enhanced fingerprint checking with detailed debugging."""
+        self.logger.log_admin(
+            self.logged_in_username,
+            "CheckFingerprint",
+            True,
+            "Starting fingerprint check..."
+        )
+
+        # The sensor search blocks for up to 30s; run it off the Tk thread.
+        self._run_in_thread(
+            self.admin_fingerprint.fingerprint_manager.search_fingerprint,
+            self._on_check_fingerprint_done
+        )
+
+    def _on_check_fingerprint_done(self, result, error):
+        """Handle the sensor search result back on the Tk main thread."""
         try:
-            self.logger.log_admin(
-                self.logged_in_username,
-                "CheckFingerprint",
-                True,
-                "Starting fingerprint check..."
-            )
+            if error is not None:
+                raise error
 
-            # Get fingerprint match from sensor
-            found, finger_id, confidence = self.admin_fingerprint.fingerprint_manager.search_fingerprint()
+            found, finger_id, confidence = result
 
             self.logger.log_admin(
                 self.logged_in_username,
@@ -484,30 +634,30 @@ class AdminAppGUI:
                 messagebox.showwarning("Not Found", "No matching fingerprint found")
                 return
 
-            # Get all records for debugging
-            hajj_records = get_hajj_records()
+            # Index-backed point query: the expression index on the JSON
+            # location turns this into a B-tree seek, with no need to load
+            # and parse every record first.
+            found_record = get_hajj_record_by_fp_location(finger_id)
+
+            # One summary line instead of a log write per record: the old
+            # per-record logging was the dominant cost of this operation.
             self.logger.log_admin(
                 self.logged_in_username,
                 "CheckFingerprint",
                 True,
-                f"Retrieved {len(hajj_records)} records from database"
+                f"Looked up finger_id={finger_id} via location index"
             )
-
-            # Search through records with detailed logging
-            found_record = None
-            for record in hajj_records:
-                if record.get('fingerprint_data'):
-                    stored_location = record['fingerprint_data'].get('location')
-                    self.logger.log_admin(
-                        self.logged_in_username,
-                        "CheckFingerprint",
-                        True,
-                        f"Checking record: hajj_id={record['hajj_id']}, stored_location={stored_location}, comparing with finger_id={finger_id}"
-                    )
-
-                    if stored_location == str(finger_id):
-                        found_record = record
-                        break
+            if os.environ.get("HAJJ_DEBUG"):
+                for record in self._get_hajj_records_cached():
+                    fp = record.get('fingerprint_data')
+                    if fp:
+                        self.logger.log_admin(
+                            self.logged_in_username,
+                            "CheckFingerprint",
+                            True,
+                            f"Record: hajj_id={record['hajj_id']}, "
+                            f"stored_location={fp.get('location')}"
+                        )
 
             if found_record:
                 self.logger.log_admin(
@@ -585,11 +735,9 @@ class AdminAppGUI:
 
         try:
             # Clean up database record
-            conn = get_connection()
-            c = conn.cursor()
-            c.execute("DELETE FROM hajj_records WHERE hajj_id = ?", (hajj_id,))
-            conn.commit()
-            conn.close()
+            with self._conn:
+                self._conn.execute("DELETE FROM hajj_records WHERE hajj_id = ?", (hajj_id,))
+            self._invalidate_records_cache()
 
             self.logger.log_admin(
                 self.logged_in_username,
@@ -645,9 +793,18 @@ class AdminAppGUI:
                 self.logger.log_admin(self.logged_in_username, "AddHajj", False, "Cancelled at Hajj ID entry")
                 return
 
-            # Check if Hajj ID already exists
-            existing_records = get_hajj_records()
-            if any(record['hajj_id'] == hajj_id for record in existing_records):
+            # Check if Hajj ID already exists. Sets built once make both
+            # duplicate checks O(1) instead of a scan per check.
+            existing_records = self._get_hajj_records_cached()
+            existing_ids = {record['hajj_id'] for record in existing_records}
+            registered_uids = set()
+            for record in existing_records:
+                # Bind the nested dict once instead of chained gets
+                nfc = record.get('nfc_data')
+                uid_value = nfc.get('uid') if nfc else None
+                if uid_value:
+                    registered_uids.add(uid_value)
+            if hajj_id in existing_ids:
                 self.logger.log_admin(self.logged_in_username, "AddHajj", False, f"Hajj ID {hajj_id} already exists")
                 messagebox.showerror("Error", "This Hajj ID already exists in the system")
                 return
@@ -673,7 +830,7 @@ class AdminAppGUI:
                 self.logged_in_username,
                 f"AddHajj[{hajj_id}]",
                 True,
-                "Initial record created"
+                "ID and name collected (DB write deferred to enrollment end)"
             )
 
             # Stage 3: NFC Card Registration
@@ -682,37 +839,33 @@ class AdminAppGUI:
                 self.logger.log_admin(self.logged_in_username, "AddHajj", False, "Cancelled at NFC stage")
                 return
 
-            # NFC Detection with timeout and retries
-            max_retries = 3
-            for attempt in range(max_retries):
-                self.logger.log_admin(
-                    self.logged_in_username,
-                    f"AddHajj[{hajj_id}]",
-                    True,
-                    f"NFC detection attempt {attempt + 1}/{max_retries}"
-                )
-
-                uid = self.admin_nfc.pn532_nfc.wait_for_card(timeout=5)
-                if uid:
-                    break
+            # Single long detection window: with the PN532 IRQ wired this
+            # sleeps until the card arrives instead of running three
+            # 5-second polling rounds with a retry dialog between them.
+            self.logger.log_admin(
+                self.logged_in_username,
+                f"AddHajj[{hajj_id}]",
+                True,
+                "Waiting for NFC card (up to 15s)"
+            )
 
-                if attempt < max_retries - 1:
-                    if not messagebox.askyesno("Retry", "No NFC card detected. Try again?"):
-                        self.logger.log_admin(self.logged_in_username, "AddHajj", False, "User cancelled NFC retry")
-                        return
-                else:
-                    raise Exception("No NFC card detected after maximum attempts")
+            uid = self.admin_nfc.pn532_nfc.wait_for_card_irq(timeout=15)
+            if not uid:
+                raise Exception("No NFC card detected within 15 seconds")
 
-            # Check if NFC card is already registered
-            uid_str = '-'.join(hex(i)[2:] for i in uid)
-            if any(record.get('nfc_data', {}).get('uid') == uid_str for record in existing_records):
+            # Check if NFC card is already registered. bytes.hex does the
+            # whole separator-joined encode in one C call.
+            uid_str = bytes(uid).hex('-')
+            if uid_str in registered_uids:
                 self.logger.log_admin(self.logged_in_username, "AddHajj", False,
                                       f"NFC card {uid_str} already registered")
                 messagebox.showerror("Error", "This NFC card is already registered in the system")
                 return
 
-            # Write data to NFC card
-            encrypted_data = self.admin_nfc.write_nfc_data(hajj_id)
+            # Write data to NFC card, reusing the UID detected above so
+            # the write hits the same card the duplicate check inspected
+            # instead of opening a second detection window.
+            encrypted_data = self.admin_nfc.write_nfc_data(hajj_id, uid=uid)
             if not encrypted_data:
                 raise Exception("Failed to write to NFC card - encryption error")
 
@@ -723,11 +876,11 @@ class AdminAppGUI:
                 'decrypted_data': hajj_id
             }
 
-            # Stage 4: Save Initial Record
-            new_record = create_hajj_record(record)
-            if not new_record:
-                raise Exception("Database error: Failed to create initial record")
-
+            # Stage 4: NFC stage complete. The record is not inserted yet:
+            # everything is collected locally and written in one
+            # create_hajj_record call after the fingerprint stage, so the
+            # DB never holds a partial "NFC but no fingerprint" record and
+            # each enrollment serializes the payload exactly once.
             self.logger.log_admin(
                 self.logged_in_username,
                 f"AddHajj[{hajj_id}]",
@@ -760,19 +913,22 @@ class AdminAppGUI:
             # Get fingerprint data with error handling
             try:
                 template = self.admin_fingerprint.fingerprint_manager.finger.get_fpdata()
-                raw_image = template  # Use same data if separate raw image not needed
 
+                # The old raw_image field was a byte-for-byte copy of the
+                # template, doubling every enrolled record for no new data.
                 fingerprint_data = {
                     'location': str(location),
-                    'template': template.hex() if isinstance(template, bytes) else bytes(template).hex(),
-                    'raw_image': raw_image.hex() if isinstance(raw_image, bytes) else bytes(raw_image).hex(),
-                    'timestamp': time.strftime("%Y-%m-%d %H:%M:%S")
+                    'template': (template if isinstance(template, bytes)
+                                 else bytes(template)),
+                    'timestamp': datetime.datetime.now().isoformat(sep=' ', timespec='seconds')
                 }
 
-                # Update record with fingerprint data
-                updated_record = update_hajj_record(hajj_id, {'fingerprint_data': fingerprint_data})
-                if not updated_record:
-                    raise Exception("Failed to update record with fingerprint data")
+                # Single atomic insert carrying NFC + fingerprint together
+                record['fingerprint_data'] = fingerprint_data
+                new_record = create_hajj_record(record)
+                self._invalidate_records_cache()
+                if not new_record:
+                    raise Exception("Database error: Failed to create record")
 
             except Exception as fp_error:
                 # Clean up on fingerprint data error
@@ -799,10 +955,10 @@ class AdminAppGUI:
             # Show detailed success summary
             summary = (
                 f"Enrollment Complete!\n\n"
-                f"Hajj ID: {updated_record['hajj_id']}\n"
-                f"Name: {updated_record['name']}\n"
-                f"NFC UID: {updated_record['nfc_data'].get('uid', 'N/A')}\n"
-                f"Fingerprint Location: {updated_record['fingerprint_data'].get('location', 'N/A')}\n\n"
+                f"Hajj ID: {new_record['hajj_id']}\n"
+                f"Name: {new_record['name']}\n"
+                f"NFC UID: {new_record['nfc_data'].get('uid', 'N/A')}\n"
+                f"Fingerprint Location: {new_record['fingerprint_data'].get('location', 'N/A')}\n\n"
                 f"Timestamp: {fingerprint_data['timestamp']}"
             )
             messagebox.showinfo("Success", summary)
@@ -857,10 +1013,27 @@ class AdminAppGUI:
 
     def _exit_app(self):
         """Clean up and exit application."""
+        # Watchdog: if a stuck serial driver blocks teardown, force the
+        # process out after 2 seconds rather than hanging on exit.
+        watchdog = threading.Timer(2.0, lambda: os._exit(1))
+        watchdog.daemon = True
+        watchdog.start()
+
         try:
-            # Close hardware connections
+            # Close hardware connections. Dropping the buffers and timeout
+            # first means close() can't block for a pending transaction's
+            # full UART timeout.
             if hasattr(self, 'admin_fingerprint'):
-                self.admin_fingerprint.fingerprint_manager.uart.close()
+                uart = self.admin_fingerprint.fingerprint_manager.uart
+                try:
+                    uart.timeout = 0.1
+                    uart.reset_input_buffer()
+                    uart.reset_output_buffer()
+                finally:
+                    uart.close()
+
+            if hasattr(self, '_conn'):
+                self._conn.close()
 
             self.logger.log_admin(
                 self.logged_in_username,
@@ -2,11 +2,14 @@
 
 import datetime
 import logging
+import time
 from typing import Optional, List, Any
 
-from PySide6.QtCore import QTimer
+from PySide6.QtCore import (
+    QObject, QRunnable, QSocketNotifier, QThreadPool, QTimer, Signal
+)
 
-from db.hajj_db import get_hajj_records
+from db.hajj_db import get_hajj_records, get_data_version
 from hardware.sound_manager import SoundManager
 from logic.user_workflow_helpers import (
     verify_nfc_data,
@@ -21,6 +24,36 @@ from ui.pyside6_scenes import SceneType, MessageType, TripCompleteScene, Headcou
 logger = logging.getLogger(__name__)
 
 
+class _VerifySignals(QObject):
+    finished = Signal(str, object)
+
+
+class _VerifyWorker(QRunnable):
+    """
+    Runs the serial fingerprint match off the UI thread.
+
+    check_specific_finger blocks for hundreds of milliseconds on the
+    57600-baud UART; running it in the QTimer slot froze the event loop
+    for the whole exchange. The result is delivered back to the UI thread
+    through the finished signal.
+    """
+
+    def __init__(self, hajj_id: str, fingerprint_manager: Any, location: int) -> None:
+        super().__init__()
+        self.signals = _VerifySignals()
+        self._hajj_id = hajj_id
+        self._fingerprint_manager = fingerprint_manager
+        self._location = location
+
+    def run(self) -> None:
+        try:
+            result = self._fingerprint_manager.check_specific_finger(self._location)
+        except Exception:
+            logger.exception("Fingerprint worker failed")
+            result = None
+        self.signals.finished.emit(self._hajj_id, result)
+
+
 class UserWorkflow:
     def __init__(
             self,
@@ -42,26 +75,157 @@ class UserWorkflow:
         self.scene_manager = gui_window.scene_manager if gui_window else None
         self.sound_manager = SoundManager()
 
+        # Typed scene handles resolved once: the success and headcount
+        # paths used to do a dict lookup plus isinstance on every event.
+        # The success scene is built lazily by the scene manager, so its
+        # handle is resolved on first use (see _get_success_scene).
+        self._success_scene: Optional[HajjScene] = None
+        self._headcount_scene: Optional[HeadcountResultScene] = None
+        if self.scene_manager:
+            headcount_scene = self.scene_manager.scenes.get(SceneType.HEADCOUNT_RESULT)
+            if isinstance(headcount_scene, HeadcountResultScene):
+                self._headcount_scene = headcount_scene
+
         # State tracking / flags
         self.current_phase = WorkflowPhase.PHASE_ONE
-        self.hajj_id_scans: List[str] = []
+        # Insertion-ordered dict: O(1) membership per boarding while
+        # keeping scan order for the trip log (a list scan went quadratic
+        # over a full bus).
+        self.hajj_id_scans: dict = {}
         self.trip_number: int = 1
         self.trip_start_time: Optional[datetime.datetime] = None
+        # Monotonic start mark: durations survive NTP stepping the wall
+        # clock mid-trip (common right after a Pi boot).
+        self.trip_start_monotonic: Optional[float] = None
         self.trip_end_time: Optional[datetime.datetime] = None
         self.door_status: bool = True
         self.nfc_reader_active = True
 
+        # Last rendered headcount result and welcome name, used to skip
+        # redundant repaints when an identical result comes back.
+        self._last_headcount: Optional[tuple] = None
+        self._last_welcome: Optional[str] = None
+
+        # Record cache keyed by hajj_id, reloaded only when the DB version
+        # token changes; every NFC tap and fingerprint check used to re-read
+        # and re-parse the full table.
+        self._records_by_id: dict = {}
+        self._location_by_id: dict = {}
+        self._known_ids: frozenset = frozenset()
+        self._records_version = -1
+
+        # Phase dispatch: the active handlers are swapped at phase
+        # transitions instead of every event re-checking current_phase.
+        self._nfc_handler = self._ignore_event
+        self._fp_handler = self._ignore_event
+
         # Door monitoring timer
         self.monitor_timer = QTimer()
         self.monitor_timer.timeout.connect(self._monitor_nfc_and_door)
 
-        # Initialize scene transitions
+        # Pending single-shot timers, kept so cleanup() can cancel queued
+        # scene jumps instead of racing the event loop at shutdown.
+        self._pending_timers: set = set()
+
+        # IRQ-driven NFC wake: when the PN532's interrupt line is wired,
+        # react to a card entering the field the moment the line fires
+        # instead of waiting for the next 1 Hz poll. The timer keeps
+        # running as a door-status check and polling fallback.
+        self._nfc_notifier: Optional[QSocketNotifier] = None
+        self._setup_nfc_irq_notifier()
+
+        # Single-thread pool for the blocking fingerprint exchange; one
+        # reusable thread avoids per-scan thread creation and keeps the
+        # sensor serialized.
+        self._verify_pool = QThreadPool()
+        self._verify_pool.setMaxThreadCount(1)
+
+        # Initialize scene transitions. Monitoring itself starts in run(),
+        # which main.py calls right before showing the window; starting it
+        # here too re-armed the timer and logged phase-one startup twice.
         if self.scene_manager:
             self.scene_manager.scene_changed.connect(self.handle_scene_change)
             self.scene_manager.switch_to_scene(SceneType.CARD_SCAN)
 
-        # Start monitoring
-        self.start_phase_one()
+    def _refresh_record_caches(self) -> None:
+        """Rebuild the record caches if the DB version token changed."""
+        version = get_data_version()
+        if version == self._records_version:
+            return
+        self._records_by_id = {
+            record['hajj_id']: record for record in get_hajj_records()
+        }
+        # Per-scan verification only needs the fingerprint location, so
+        # keep it in its own flat map instead of digging through the
+        # record dict on every tap.
+        self._location_by_id = {}
+        for record in self._records_by_id.values():
+            fp = record.get('fingerprint_data')
+            if fp and fp.get('location') is not None:
+                self._location_by_id[record['hajj_id']] = int(fp['location'])
+        self._known_ids = frozenset(self._records_by_id)
+        self._records_version = version
+
+    def _get_record(self, hajj_id: str) -> Optional[dict]:
+        """Return the cached record for hajj_id, reloading on DB changes."""
+        self._refresh_record_caches()
+        return self._records_by_id.get(hajj_id)
+
+    def get_records_by_id(self) -> dict:
+        """
+        Return the cached hajj_id -> record map for read-only use.
+
+        The dev panel and trip summaries read passenger names through
+        this instead of re-querying the table; the version token keeps
+        the map current.
+        """
+        self._refresh_record_caches()
+        return self._records_by_id
+
+    def _setup_nfc_irq_notifier(self) -> None:
+        """Hook the PN532 IRQ line into the Qt event loop when available."""
+        irq_line = getattr(self.nfc, '_irq_line', None)
+        if irq_line is None:
+            return
+        try:
+            self._nfc_notifier = QSocketNotifier(
+                irq_line.event_get_fd(), QSocketNotifier.Read)
+            self._nfc_notifier.activated.connect(self._on_nfc_irq)
+            logger.info("NFC IRQ notifier active, card taps wake the event loop")
+        except Exception as e:
+            logger.warning(f"NFC IRQ notifier unavailable, polling only: {e}")
+            self._nfc_notifier = None
+
+    def _on_nfc_irq(self) -> None:
+        """Card-arrival interrupt: drain the edge event and run one poll."""
+        try:
+            irq_line = getattr(self.nfc, '_irq_line', None)
+            if irq_line is not None:
+                irq_line.event_read()
+        except Exception as e:
+            logger.debug(f"Error draining NFC IRQ event: {e}")
+        self._monitor_nfc_and_door()
+
+    @staticmethod
+    def _ignore_event(*_args) -> None:
+        """No-op handler installed while the phase doesn't accept the event."""
+
+    def _single_shot(self, ms: int, slot) -> None:
+        """Start a tracked single-shot timer that cleanup() can cancel."""
+        timer = QTimer()
+        timer.setSingleShot(True)
+        self._pending_timers.add(timer)
+
+        def _fire():
+            self._pending_timers.discard(timer)
+            slot()
+
+        timer.timeout.connect(_fire)
+        timer.start(ms)
+
+    def _back_to_card_scan(self) -> None:
+        """Return to the card-scan scene (shared deferred transition)."""
+        self.scene_manager.switch_to_scene(SceneType.CARD_SCAN)
 
     def switch_to_scene(self, scene_type: SceneType):
         try:
@@ -74,6 +238,11 @@ class UserWorkflow:
         """Clean up resources"""
         try:
             self.monitor_timer.stop()
+            for timer in self._pending_timers:
+                timer.stop()
+            self._pending_timers.clear()
+            if self._nfc_notifier is not None:
+                self._nfc_notifier.setEnabled(False)
             cleanup_hardware(self.camera_manager)
             # Any other cleanup needed
         except Exception as e:
@@ -99,7 +268,12 @@ class UserWorkflow:
         """Initialize Phase One: NFC and fingerprint verification."""
         self.logger.info("Starting Phase 1: NFC scanning and fingerprint verification")
         self.current_phase = WorkflowPhase.PHASE_ONE
+        self._nfc_handler = self.handle_nfc_detection
+        self._fp_handler = self.handle_fingerprint_verification
         self.nfc_reader_active = True
+        # Warm the record caches at startup so the first tap (and any
+        # dev-panel lookup) never pays the initial table read.
+        self._refresh_record_caches()
         self.monitor_timer.start(1000)
 
     def _monitor_nfc_and_door(self) -> None:
@@ -114,101 +288,121 @@ class UserWorkflow:
             # Monitor for NFC card
             if self.nfc_reader_active:
                 if nfc_data := self.nfc.read_nfc(timeout=0.1):
-                    self.handle_nfc_detection(nfc_data)
+                    self._nfc_handler(nfc_data)
 
         except Exception as e:
             self.logger.exception("Error during monitoring")
             self.gui_window.show_message(f"Error: {str(e)}", MessageType.ERROR)
 
     def handle_nfc_detection(self, nfc_data: str) -> None:
-        """Process detected NFC card with database verification."""
-        if self.current_phase != WorkflowPhase.PHASE_ONE:
-            return
+        """Process detected NFC card with database verification.
 
+        Only installed as _nfc_handler during phase one; other phases run
+        the no-op handler instead of re-checking current_phase here.
+        """
         self.scene_manager.switch_to_scene(SceneType.WAIT)
 
         if hajj_id := verify_nfc_data(nfc_data, self.encryption_manager):
             try:
-                hajj_records = get_hajj_records()
-                if not any(record['hajj_id'] == hajj_id for record in hajj_records):
+                self._refresh_record_caches()
+                if hajj_id not in self._known_ids:
                     self.scene_manager.switch_to_scene(SceneType.CARD_FAILED)
                     self.sound_manager.play_fail()
-                    QTimer.singleShot(5000, lambda: self.scene_manager.switch_to_scene(SceneType.CARD_SCAN))
+                    self._single_shot(5000, self._back_to_card_scan)
                     return
 
                 self.sound_manager.play_success()
                 self.scene_manager.switch_to_scene(SceneType.FINGER_SCAN)
-                QTimer.singleShot(2000, lambda: self.handle_fingerprint_verification(hajj_id))
+                self._single_shot(2000, lambda: self._fp_handler(hajj_id))
 
             except Exception as e:
                 logger.exception("Database verification failed")
                 self.scene_manager.switch_to_scene(SceneType.CARD_FAILED)
                 self.sound_manager.play_fail()
-                QTimer.singleShot(5000, lambda: self.scene_manager.switch_to_scene(SceneType.CARD_SCAN))
+                self._single_shot(5000, self._back_to_card_scan)
         else:
             self.scene_manager.switch_to_scene(SceneType.CARD_FAILED)
             self.sound_manager.play_fail()
-            QTimer.singleShot(5000, lambda: self.scene_manager.switch_to_scene(SceneType.CARD_SCAN))
+            self._single_shot(5000, self._back_to_card_scan)
 
     # In UserWorkflow class
     def handle_fingerprint_verification(self, hajj_id: str) -> None:
-        """Verify fingerprint matches Hajj ID."""
-        if self.current_phase != WorkflowPhase.PHASE_ONE:
-            return
-
+        """Verify fingerprint matches Hajj ID (phase-one handler)."""
         try:
-            hajj_records = get_hajj_records()
-            stored_record = next((record for record in hajj_records
-                                  if record['hajj_id'] == hajj_id), None)
+            # Refresh the caches if the DB changed, then take the location
+            # from the flat map: one dict lookup on the per-scan path.
+            self._refresh_record_caches()
+            stored_location = self._location_by_id.get(hajj_id)
 
-            if not stored_record or not stored_record.get('fingerprint_data'):
+            if stored_location is None:
                 self.scene_manager.switch_to_scene(SceneType.ACCESS_DENIED)
                 self.sound_manager.play_fail()
                 self.nfc_reader_active = True
                 return
 
-            stored_location = int(stored_record['fingerprint_data'].get('location'))
-            result = self.fingerprint_manager.check_specific_finger(stored_location)
+            # The serial exchange runs on the worker thread; the result
+            # comes back to the UI thread via the finished signal.
+            worker = _VerifyWorker(hajj_id, self.fingerprint_manager, stored_location)
+            worker.signals.finished.connect(self._on_fingerprint_result)
+            self._verify_pool.start(worker)
 
+        except Exception as e:
+            logger.exception("Fingerprint verification error")
+            self._show_fingerprint_failed()
+
+    def _on_fingerprint_result(self, hajj_id: str, result: Optional[dict]) -> None:
+        """UI-thread slot handling the worker's match result."""
+        try:
             if result and result["matched"]:
-                if hajj_id not in self.hajj_id_scans:
-                    self.hajj_id_scans.append(hajj_id)
+                self.hajj_id_scans[hajj_id] = None
 
                 # Get passenger name for welcome message
-                passenger_name = stored_record.get('name', 'Passenger')
+                stored_record = self._get_record(hajj_id)
+                passenger_name = stored_record.get('name', 'Passenger') if stored_record else 'Passenger'
 
-                # Update success scene with personalized message
-                success_scene = self.scene_manager.scenes[SceneType.SUCCESS]
+                # Update success scene with personalized message; skip the
+                # setText when the same passenger re-scans back to back.
                 self.sound_manager.play_success()
-                if isinstance(success_scene, HajjScene):
+                success_scene = self._get_success_scene()
+                if success_scene is not None and passenger_name != self._last_welcome:
+                    self._last_welcome = passenger_name
                     success_scene.message_label.setText(f"Welcome {passenger_name}, please be seated")
 
                 self.scene_manager.switch_to_scene(SceneType.SUCCESS)
-                QTimer.singleShot(3000, lambda: self.scene_manager.switch_to_scene(SceneType.CARD_SCAN))
+                self._single_shot(3000, self._back_to_card_scan)
             else:
-                self.scene_manager.switch_to_scene(SceneType.FINGER_FAILED)
-                self.sound_manager.play_fail()
-                QTimer.singleShot(3000, lambda: self.scene_manager.switch_to_scene(SceneType.CARD_SCAN))
-                self.nfc_reader_active = True
+                self._show_fingerprint_failed()
 
         except Exception as e:
             logger.exception("Fingerprint verification error")
-            self.scene_manager.switch_to_scene(SceneType.FINGER_FAILED)
-            self.sound_manager.play_fail()
-            QTimer.singleShot(3000, lambda: self.scene_manager.switch_to_scene(SceneType.CARD_SCAN))
-            self.nfc_reader_active = True
+            self._show_fingerprint_failed()
+
+    def _get_success_scene(self) -> Optional[HajjScene]:
+        """Resolve and cache the success scene handle on first use."""
+        if self._success_scene is None and self.scene_manager:
+            scene = self.scene_manager.get_scene(SceneType.SUCCESS)
+            if isinstance(scene, HajjScene):
+                self._success_scene = scene
+        return self._success_scene
+
+    def _show_fingerprint_failed(self) -> None:
+        """Show the finger-failed scene and re-arm the NFC reader."""
+        self.scene_manager.switch_to_scene(SceneType.FINGER_FAILED)
+        self.sound_manager.play_fail()
+        self._single_shot(3000, self._back_to_card_scan)
+        self.nfc_reader_active = True
 
     def transition_to_phase_two(self) -> None:
         """Transition from Phase One to Phase Two."""
         self.logger.info("Door closed, transitioning to Phase 2")
         self.monitor_timer.stop()
         self.current_phase = WorkflowPhase.PHASE_TWO
+        self._nfc_handler = self._ignore_event
+        self._fp_handler = self._ignore_event
         self.start_phase_two()
 
     def start_phase_two(self) -> None:
         """Initialize Phase Two: PIN verification and trip start."""
-        if self.current_phase != WorkflowPhase.PHASE_TWO:
-            return
         self.logger.info("Starting Phase 2: PIN entry for trip initiation")
         self.nfc_reader_active = False
         self.scene_manager.switch_to_scene(SceneType.PIN_ENTRY)
@@ -228,19 +422,27 @@ class UserWorkflow:
                 len(self.hajj_id_scans)
             )
 
-            # Show result scene
-            result_scene = self.scene_manager.scenes[SceneType.HEADCOUNT_RESULT]
-            if isinstance(result_scene, HeadcountResultScene):
-                result_scene.set_result(
+            # Skip only the label repaint when a retry produced the
+            # identical result and the result scene is already showing;
+            # the scene switch must always happen because we arrive here
+            # from the processing spinner.
+            key = (headcount_result['success'],
+                   headcount_result['detected_count'],
+                   headcount_result['scanned_count'])
+            already_shown = (
+                key == self._last_headcount
+                and self.scene_manager.current_scene_type == SceneType.HEADCOUNT_RESULT)
+            self._last_headcount = key
+            if self._headcount_scene is not None and not already_shown:
+                self._headcount_scene.set_result(
                     headcount_result['success'],
                     f"Headcount {'Verified' if headcount_result['success'] else 'Mismatch'}: "
                     f"{headcount_result['detected_count']}/{headcount_result['scanned_count']}"
                 )
-
             self.scene_manager.switch_to_scene(SceneType.HEADCOUNT_RESULT)
 
             # Auto-proceed after showing result
-            QTimer.singleShot(5000, lambda: self.proceed_with_trip(headcount_result['success']))
+            self._single_shot(5000, lambda: self.proceed_with_trip(headcount_result['success']))
 
         except Exception as e:
             self.logger.exception("Error during headcount check")
@@ -251,23 +453,27 @@ class UserWorkflow:
         """Start new trip and perform headcount verification."""
         self.logger.info("Starting trip verification process")
         self.trip_start_time = datetime.datetime.now()
+        self.trip_start_monotonic = time.monotonic()
 
         # First ensure we're showing the processing scene
         if self.scene_manager.current_scene_type != SceneType.HEADCOUNT_PROCESSING:
             self.scene_manager.switch_to_scene(SceneType.HEADCOUNT_PROCESSING)
 
         # Use QTimer to ensure processing scene is visible before continuing
-        QTimer.singleShot(1500, self._perform_headcount)
+        self._single_shot(1500, self._perform_headcount)
 
     def end_trip(self) -> None:
         """End current trip and reset for next one."""
         try:
             self.trip_end_time = datetime.datetime.now()
+            duration_seconds = (time.monotonic() - self.trip_start_monotonic
+                                if self.trip_start_monotonic is not None else 0.0)
             trip_data = process_trip_data(
                 self.trip_number,
-                self.hajj_id_scans,
+                list(self.hajj_id_scans),
                 self.trip_start_time or datetime.datetime.now(),
-                self.trip_end_time
+                self.trip_end_time,
+                duration_seconds
             )
 
             self.logger.log_trip(self.trip_number, trip_data)
@@ -287,20 +493,24 @@ class UserWorkflow:
     def reset_for_new_trip(self):
         """Reset workflow state for a new trip"""
         # Reset all state variables
-        self.hajj_id_scans = []
+        self.hajj_id_scans = {}
         self.trip_start_time = None
+        self.trip_start_monotonic = None
         self.trip_end_time = None
         self.trip_number += 1
         self.current_phase = WorkflowPhase.PHASE_ONE
+        self._nfc_handler = self.handle_nfc_detection
+        self._fp_handler = self.handle_fingerprint_verification
         self.door_status = True  # Reset door status to open
         self.nfc_reader_active = True
+        self._last_headcount = None
 
         # Ensure we're in CARD_SCAN scene
         if hasattr(self, 'scene_manager'):
             self.scene_manager.switch_to_scene(SceneType.CARD_SCAN)
 
         # Start monitoring only after scene transition
-        QTimer.singleShot(500, lambda: self.monitor_timer.start(1000))
+        self._single_shot(500, lambda: self.monitor_timer.start(1000))
 
     def show_message(self, message: str, message_type: MessageType):
         """Show message in GUI window"""
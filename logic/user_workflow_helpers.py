@@ -3,32 +3,65 @@
 import datetime
 import cv2
 import logging
+import os
 from typing import Dict, Any, List, Optional
 
-from db.hajj_db import get_hajj_records
+from db.hajj_db import get_hajj_records, get_data_version
 
 logger = logging.getLogger(__name__)
 
+# location -> hajj_id map for fingerprint verification, rebuilt only when
+# the DB version token moves instead of re-scanning the table per check.
+_loc_to_hajj: Dict[str, str] = {}
+_loc_map_version = -1
+
+
+def _get_loc_to_hajj() -> Dict[str, str]:
+    """Return the cached location map, reloading on DB changes."""
+    global _loc_to_hajj, _loc_map_version
+    version = get_data_version()
+    if version != _loc_map_version:
+        mapping = {}
+        for record in get_hajj_records():
+            fp = record.get('fingerprint_data')
+            location = fp.get('location') if fp else None
+            if location is not None:
+                mapping[str(location)] = record['hajj_id']
+        _loc_to_hajj = mapping
+        _loc_map_version = version
+    return _loc_to_hajj
+
 def verify_nfc_data(nfc_data: str, encryption_manager: Any) -> Optional[str]:
     """
     Verify and decrypt NFC card data.
     Returns decrypted Hajj ID if successful, None otherwise.
     """
+    # Passthrough when no encryption is configured: no try frame, no log
+    # formatting on the hot path.
+    if encryption_manager is None:
+        return nfc_data
+
     try:
-        logger.info("Verifying NFC card data...")
-        hajj_id = (encryption_manager.decrypt_data(nfc_data)
-                  if encryption_manager else nfc_data)
-        logger.info(f"Decrypted Hajj ID: {hajj_id}")
+        hajj_id = encryption_manager.decrypt_data(nfc_data)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Decrypted Hajj ID: %s", hajj_id)
         return hajj_id
     except Exception as e:
         logger.exception("NFC verification failed")
         return None
 
 
-def verify_fingerprint(fingerprint_manager: Any, hajj_id: str) -> bool:
+def verify_fingerprint(
+    fingerprint_manager: Any,
+    hajj_id: str,
+    known_locations: Optional[Dict[str, int]] = None
+) -> bool:
     """
     Verify fingerprint matches the provided Hajj ID.
     Returns True if verified with sufficient confidence, False otherwise.
+
+    Callers that already maintain a hajj_id -> location map can pass it as
+    known_locations to skip the per-call table read.
     """
     min_confidence = 50  # Minimum confidence threshold
 
@@ -37,11 +70,9 @@ def verify_fingerprint(fingerprint_manager: Any, hajj_id: str) -> bool:
         logger.info(f"Fingerprint scan result: Found={found}, Confidence={confidence}")
 
         if found and fp_id is not None and confidence >= min_confidence:
-            for record in get_hajj_records():
-                if (record.get('fingerprint_data') and
-                        record['fingerprint_data'].get('location') == str(fp_id) and
-                        record['hajj_id'] == hajj_id):
-                    return True
+            if known_locations is not None:
+                return known_locations.get(hajj_id) == fp_id
+            return _get_loc_to_hajj().get(str(fp_id)) == hajj_id
 
         if found and confidence < min_confidence:
             logger.warning(f"Fingerprint match found but confidence too low: {confidence}")
@@ -70,7 +101,9 @@ def perform_headcount_check(camera_manager: Any, scanned_count: int) -> Dict[str
         return result
 
     try:
-        counts = camera_manager.get_three_counts()
+        # Stop capturing as soon as a frame accounts for everyone who
+        # scanned; only a short count pays for all three inferences.
+        counts = camera_manager.get_counts_until(scanned_count)
         head_count = max(counts)
         result['detected_count'] = head_count
 
@@ -102,30 +135,42 @@ def process_trip_data(
     trip_number: int,
     hajj_ids: List[str],
     start_time: datetime.datetime,
-    end_time: datetime.datetime
+    end_time: datetime.datetime,
+    duration_seconds: Optional[float] = None
 ) -> Dict[str, Any]:
     """
     Process and format trip data for logging.
     Returns formatted trip data dictionary.
+
+    Callers should pass duration_seconds measured with time.monotonic();
+    the wall-clock fallback can go negative if NTP steps the clock
+    mid-trip.
     """
-    duration = end_time - start_time
+    if duration_seconds is None:
+        duration_seconds = (end_time - start_time).total_seconds()
     return {
         "trip_number": trip_number,
         "hajj_ids": hajj_ids,
         "passenger_count": len(hajj_ids),
         "start_time": start_time.isoformat(),
         "end_time": end_time.isoformat(),
-        "duration_seconds": duration.total_seconds(),
+        "duration_seconds": duration_seconds,
     }
 
 def cleanup_hardware(camera_manager: Any) -> None:
     """
     Clean up hardware resources after trip completion.
+
+    Only releases the capture we own. cv2.destroyAllWindows() used to run
+    here too, but this app never opens HighGUI windows and the call blocks
+    on the GUI event loop; debug builds can opt back in via the
+    DEBUG_CV_WINDOWS env flag.
     """
     try:
-        if (camera_manager and hasattr(camera_manager, 'cap') and
-            camera_manager.cap.isOpened()):
-            camera_manager.cap.release()
-        cv2.destroyAllWindows()
+        cap = getattr(camera_manager, 'cap', None) if camera_manager else None
+        if cap is not None and cap.isOpened():
+            cap.release()
+        if os.environ.get('DEBUG_CV_WINDOWS'):
+            cv2.destroyAllWindows()
     except Exception as e:
         logger.exception("Error during hardware cleanup")
\ No newline at end of file
@@ -10,20 +10,66 @@ An interactive terminal menu is provided to list and execute these functions.
 
 import os
 import json
+import select
 import time
 import serial
 import adafruit_fingerprint
 
 from db.hajj_db import get_hajj_records
 
+# orjson (de)serializes the metadata records in one C-level pass; the
+# stdlib module stays as the fallback, matching the hardware drivers.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _json_line(obj) -> str:
+    """Serialize one compact JSON line for the JSONL store."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode() + "\n"
+    return json.dumps(obj, separators=(',', ':')) + "\n"
+
+
+def _set_uart_low_latency(uart) -> None:
+    """
+    Set ASYNC_LOW_LATENCY on the UART so the kernel hands bytes over
+    immediately instead of batching them behind the driver's latency
+    timer (~16ms on some adapters), which caps the sensor command rate.
+    Best effort: silently keeps defaults off-Linux or on drivers that
+    reject the ioctl.
+    """
+    try:
+        import fcntl
+        import struct
+        TIOCGSERIAL = 0x541E
+        TIOCSSERIAL = 0x541F
+        ASYNC_LOW_LATENCY = 0x2000
+        buf = bytearray(fcntl.ioctl(uart.fileno(), TIOCGSERIAL, b'\0' * 0x48))
+        flags = struct.unpack_from('i', buf, 28)[0]
+        struct.pack_into('i', buf, 28, flags | ASYNC_LOW_LATENCY)
+        fcntl.ioctl(uart.fileno(), TIOCSSERIAL, bytes(buf))
+    except (ImportError, OSError):
+        pass
+
 
 class FingerprintUI:
+    # Fixed attribute layout: the scan loops hit self.finger/self.uart
+    # constantly, and __slots__ keeps each instance dict-free.
+    __slots__ = ('uart', 'poll_interval', 'finger', 'storage_path',
+                 'data_file', 'fingerprint_data', '_log_lines',
+                 '_fp_to_hajj_cache', '_cache_ts', '_used', '_next_id')
+
     def __init__(
         self,
         uart_device: str = "/dev/ttyAMA0",
         baudrate: int = 57600,
         timeout: float = 1.0,
         storage_path: str = "fingerprint_data",
+        poll_interval: float = 0.05,
     ):
         """
         Initialize the FingerprintManager.
@@ -32,26 +78,162 @@ class FingerprintUI:
         :param baudrate: Baudrate for serial communication (default: 57600)
         :param timeout: Serial timeout in seconds (default: 1.0)
         :param storage_path: Directory to store local fingerprint metadata (default: "fingerprint_data")
+        :param poll_interval: Sleep between finger polls while waiting (default: 0.05)
         """
         self.uart = serial.Serial(uart_device, baudrate, timeout=timeout)
+        _set_uart_low_latency(self.uart)
+        self.poll_interval = poll_interval
         self.finger = adafruit_fingerprint.Adafruit_Fingerprint(self.uart)
+
+        # Template/image transfers are wire-bound at the default 57600
+        # baud (~70KB images take seconds). Ask the R307 for 115200 baud
+        # and 256-byte packets, then reopen the port at the new rate.
+        # Falls back to the original settings if the sensor refuses —
+        # R308 units in particular are stuck at 57600.
+        try:
+            self._negotiate_uart(uart_device, timeout)
+        except Exception as e:
+            print(f"Keeping default UART settings ({baudrate} baud): {e}")
         self.storage_path = storage_path
 
-        # Create the storage directory if it doesn't exist.
-        if not os.path.exists(storage_path):
-            os.makedirs(storage_path)
+        # exist_ok skips the separate existence stat and its TOCTOU race.
+        os.makedirs(storage_path, exist_ok=True)
 
-        self.data_file = os.path.join(storage_path, "fingerprint_data.json")
-        if os.path.exists(self.data_file):
+        # Append-only JSONL store: each enrollment appends one line, so a
+        # session of N enrollments writes O(N) bytes instead of rewriting
+        # the whole file every time, and a crash mid-append can at worst
+        # lose the last line rather than corrupt the store.
+        self.data_file = os.path.join(storage_path, "fingerprint_data.jsonl")
+        legacy_file = os.path.join(storage_path, "fingerprint_data.json")
+        self.fingerprint_data = {}
+        self._log_lines = 0
+        # Open directly and catch FileNotFoundError rather than stat-ing
+        # first: one syscall instead of two, and no exists/open race.
+        try:
             with open(self.data_file, "r") as f:
-                self.fingerprint_data = json.load(f)
-        else:
-            self.fingerprint_data = {}
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    self._log_lines += 1
+                    self.fingerprint_data.update(_loads(line))
+        except FileNotFoundError:
+            try:
+                # One-time migration from the old whole-file JSON store.
+                with open(legacy_file, "r") as f:
+                    self.fingerprint_data = _loads(f.read())
+                self.compact()
+            except FileNotFoundError:
+                pass
+
+        # TTL-cached location -> hajj_id map so fingerprint checks don't
+        # re-fetch and scan the whole hajj table per tap.
+        self._fp_to_hajj_cache = None
+        self._cache_ts = 0.0
+
+        # O(1) ID allocation: a high-watermark plus the used-ID set
+        # replaces the linear probe over the string keys, which went
+        # quadratic across a fresh enrollment batch. Individual deletion
+        # doesn't exist (only the bulk wipe), so there is no free list.
+        self._used = set(map(int, self.fingerprint_data))
+        self._next_id = max(self._used) + 1 if self._used else 1
+
+    # set_sysparam register numbers and the target values: baud register 4
+    # takes rate/9600 with N capped at 12 by the R307, so 115200 (N=12) is
+    # the fastest the sensor accepts; packet-length register 6 takes 3 for
+    # 256-byte packets.
+    _BAUD_REG = 4
+    _BAUD_TARGET = 115200
+    _PACKET_REG = 6
+    _PACKET_256 = 3
+
+    def _negotiate_uart(self, uart_device: str, timeout: float) -> None:
+        """
+        Raise the sensor's baud rate and packet size, then reopen the port.
+
+        :param uart_device: Serial port device to reopen.
+        :param timeout: Serial timeout for the reopened port.
+        """
+        if self.finger.set_sysparam(self._BAUD_REG, self._BAUD_TARGET // 9600) \
+                != adafruit_fingerprint.OK:
+            raise RuntimeError("sensor rejected baud change")
+
+        self.uart.close()
+        self.uart = serial.Serial(uart_device, self._BAUD_TARGET, timeout=timeout)
+        _set_uart_low_latency(self.uart)
+        self.finger = adafruit_fingerprint.Adafruit_Fingerprint(self.uart)
 
-    def _save_data(self):
-        """Save the local fingerprint metadata to a JSON file."""
-        with open(self.data_file, "w") as f:
-            json.dump(self.fingerprint_data, f, indent=4)
+        # Larger packets cut per-packet framing overhead on big transfers;
+        # not fatal if the sensor declines.
+        if self.finger.set_sysparam(self._PACKET_REG, self._PACKET_256) \
+                != adafruit_fingerprint.OK:
+            print("Sensor declined 256-byte packets, keeping default.")
+        print(f"Sensor UART negotiated to {self._BAUD_TARGET} baud.")
+
+    def _wait_for_finger(self, timeout: float = 30.0) -> bool:
+        """
+        Wait for a finger without busy-looping on the UART.
+
+        The old `while get_image() != OK: pass` loops hammered the sensor
+        and pegged a CPU core. select() sleeps in the kernel until the
+        UART has pending bytes or poll_interval elapses, so get_image is
+        issued at most once per interval.
+
+        :param timeout: Maximum seconds to wait (default: 30.0)
+        :return: True once a finger image was captured, False on timeout.
+        """
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            try:
+                select.select([self.uart], [], [], self.poll_interval)
+            except (OSError, ValueError):
+                time.sleep(self.poll_interval)
+            if self.finger.get_image() == adafruit_fingerprint.OK:
+                return True
+        print("Timeout waiting for finger.")
+        return False
+
+    def _wait_for_finger_off(self, timeout: float = 3.0) -> None:
+        """
+        Wait for the finger to lift between enrollment scans.
+
+        Replaces the fixed 2-second sleep: most users lift the finger in a
+        few hundred milliseconds, so polling for NOFINGER resumes as soon
+        as the sensor is clear and the timeout only bounds the slow case.
+
+        :param timeout: Maximum seconds to wait (default: 3.0)
+        """
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if self.finger.get_image() == adafruit_fingerprint.NOFINGER:
+                return
+            try:
+                select.select([self.uart], [], [], self.poll_interval)
+            except (OSError, ValueError):
+                time.sleep(self.poll_interval)
+
+    def _append_entry(self, key: str, info: dict):
+        """Record one entry: O(1) append to the log, fsynced for crash safety."""
+        self.fingerprint_data[key] = info
+        with open(self.data_file, "a") as f:
+            f.write(_json_line({key: info}))
+            f.flush()
+            os.fsync(f.fileno())
+        self._log_lines += 1
+        # Overwrites accumulate stale lines; rewrite once they dominate.
+        if self._log_lines > 2 * len(self.fingerprint_data):
+            self.compact()
+
+    def compact(self):
+        """Rewrite the log with one line per live entry (atomic replace)."""
+        tmp_path = self.data_file + ".tmp"
+        with open(tmp_path, "w") as f:
+            for key, info in self.fingerprint_data.items():
+                f.write(_json_line({key: info}))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.data_file)
+        self._log_lines = len(self.fingerprint_data)
 
     def enroll_fingerprint(self, user_id: int = None, user_info: dict = None) -> int:
         """
@@ -61,18 +243,19 @@ class FingerprintUI:
         :param user_info: Optional dictionary of additional data to associate with this fingerprint.
         :return: The enrolled fingerprint ID if successful; otherwise, None.
         """
-        # Determine which fingerprint ID to use.
+        # Determine which fingerprint ID to use: the high-watermark,
+        # advanced past any explicitly assigned IDs so a sequential
+        # enrollment can't overwrite them. The allocation is committed
+        # only after the model is actually stored.
         if user_id is None:
-            # Find the smallest unused integer ID (as a string key in the local storage).
-            user_id = 1
-            while str(user_id) in self.fingerprint_data:
-                user_id += 1
+            while self._next_id in self._used:
+                self._next_id += 1
+            user_id = self._next_id
 
         print("=== Fingerprint Enrollment ===")
         print("Place finger on sensor...")
-        # Wait until a finger is detected.
-        while self.finger.get_image() != adafruit_fingerprint.OK:
-            pass
+        if not self._wait_for_finger():
+            return None
 
         # Convert the first image to a template in slot 1.
         if self.finger.image_2_tz(1) != adafruit_fingerprint.OK:
@@ -80,11 +263,11 @@ class FingerprintUI:
             return None
 
         print("Remove finger...")
-        time.sleep(2)
+        self._wait_for_finger_off()
 
         print("Place the same finger again...")
-        while self.finger.get_image() != adafruit_fingerprint.OK:
-            pass
+        if not self._wait_for_finger():
+            return None
 
         # Convert the second image to a template in slot 2.
         if self.finger.image_2_tz(2) != adafruit_fingerprint.OK:
@@ -101,12 +284,16 @@ class FingerprintUI:
             print("Error: Could not store fingerprint model.")
             return None
 
+        # Commit the ID allocation now that the model is stored.
+        if user_id == self._next_id:
+            self._next_id += 1
+        self._used.add(user_id)
+
         print(f"Fingerprint enrolled successfully with ID {user_id}.")
 
         # Save any additional user info locally.
         if user_info is not None:
-            self.fingerprint_data[str(user_id)] = user_info
-            self. _save_data()
+            self._append_entry(str(user_id), user_info)
 
         return user_id
 
@@ -119,8 +306,8 @@ class FingerprintUI:
         """
         print("=== Fingerprint Search ===")
         print("Place finger on sensor for search...")
-        while self.finger.get_image() != adafruit_fingerprint.OK:
-            pass
+        if not self._wait_for_finger():
+            return None
 
         if self.finger.image_2_tz(1) != adafruit_fingerprint.OK:
             print("Error: Could not convert image for search.")
@@ -159,29 +346,66 @@ class FingerprintUI:
                 print(f"  Data: {info}")
             print("-" * 30)
 
+    def _refresh_cache(self, ttl: float = 60.0) -> dict:
+        """
+        Return the location -> hajj_id map, refetching only after ttl.
+
+        :param ttl: Seconds to reuse the cached map (default: 60.0)
+        """
+        if (self._fp_to_hajj_cache is None
+                or time.monotonic() - self._cache_ts > ttl):
+            mapping = {}
+            for doc in get_hajj_records():
+                fp = doc.get("fingerprint_data")
+                # Current records store a dict with a 'location' key;
+                # very old ones stored the location string directly.
+                location = fp.get("location") if isinstance(fp, dict) else fp
+                if location is not None:
+                    mapping[str(location)] = doc.get("hajj_id")
+            self._fp_to_hajj_cache = mapping
+            self._cache_ts = time.monotonic()
+        return self._fp_to_hajj_cache
+
+    def _delete_range(self, start: int, count: int) -> None:
+        """
+        Delete a contiguous template range in as few packets as possible.
+
+        The R307's DeletChar command takes start_id + count, so one packet
+        can clear the whole range; drivers that only expose single-slot
+        delete_model(location) fall back to the per-ID loop.
+
+        :param start: First template ID to delete.
+        :param count: Number of consecutive IDs to delete.
+        """
+        try:
+            self.finger.delete_model(start, count)
+            return
+        except TypeError:
+            # Driver without the count parameter — one round-trip per ID.
+            pass
+        for template_id in range(start, start + count):
+            self.finger.delete_model(template_id)
+
     def check_finger_indb_test(self):
-        found, finger_id, conf = self.finger.finger_search
-        if not found:
+        result = self.search_finger()
+        if result is None:
             print("No finger found on sensor.")
             return None
+        finger_id = result["finger_id"]
 
         # Check local storage first
         try:
-            filepath = os.path.join(self.finger.storage_path, f"finger_{finger_id}.json")
+            filepath = os.path.join(self.storage_path, f"finger_{finger_id}.json")
             with open(filepath, 'r') as f:
-                data = json.load(f)
+                data = _loads(f.read())
                 if data.get('hajj_id'):
                     return data['hajj_id']
         except FileNotFoundError:
             pass
 
-        # Fallback to database check
-        fps_docs = get_hajj_records()
-        for doc in fps_docs:
-            if doc.get("fingerprint_data") == str(finger_id):
-                return doc.get("hajj_id")
-
-        return None
+        # Fallback to the cached database map: one dict lookup instead of
+        # a full-table fetch and linear scan per check.
+        return self._refresh_cache().get(str(finger_id))
 
     def delete_all_fingerprints(self) -> bool:
         """
@@ -190,17 +414,20 @@ class FingerprintUI:
         :return: True if the deletion process completes.
         """
         print("=== Deleting All Fingerprints ===")
-        # The R307 sensor typically allows deletion by fingerprint ID.
-        # Loop through a range of possible IDs (adjust the upper limit as needed).
-        for template_id in range(1, 128):
-            # Attempt to delete each fingerprint. The sensor will return an error if the template does not exist.
-            self.finger.delete_model(template_id)
-            # (Optional) You can check the return value if you want to report errors.
+        # One EmptyLibrary command clears the whole template store in a
+        # single packet instead of 127 delete_model round-trips. The
+        # per-ID loop remains only as a fallback for firmware that
+        # rejects the bulk opcode.
+        if self.finger.empty_library() != adafruit_fingerprint.OK:
+            print("empty_library unsupported, trying ranged delete...")
+            self._delete_range(1, 127)
 
         # Remove the local metadata file if it exists.
         if os.path.exists(self.data_file):
             os.remove(self.data_file)
         self.fingerprint_data = {}
+        self._used.clear()
+        self._next_id = 1
         print("All fingerprints deleted from sensor and local storage.")
         return True
 
@@ -215,8 +442,8 @@ class FingerprintUI:
         print("Place finger on sensor...")
 
         # Wait for finger placement
-        while self.finger.get_image() != adafruit_fingerprint.OK:
-            pass
+        if not self._wait_for_finger():
+            return None
 
         # Convert image
         if self.finger.image_2_tz(1) != adafruit_fingerprint.OK:
@@ -16,22 +16,56 @@ def setup_logging():
     return logging.getLogger('nfc_debug')
 
 
+# Factory default Mifare Classic key, built once instead of re-creating
+# the bytes literal for every sector authentication.
+DEFAULT_KEY = b"\xFF" * 6
+
+# Printable-ASCII translation table: bytes.translate runs the whole
+# 16-byte conversion in C instead of a per-byte Python loop.
+_ASCII_TABLE = bytes(c if 32 <= c <= 126 else 0x2E for c in range(256))
+
+
 def read_all_blocks(nfc, uid, num_blocks=64):
     """Try to read all blocks from the card"""
-    blocks_data = {}
+    # Accumulate the whole dump into one contiguous buffer and format it
+    # after the card I/O is done, so the hex and ASCII conversions run
+    # once over 1 KB instead of 64 times over 16 bytes.
+    full = bytearray(num_blocks * 16)
+    read_ok = [False] * num_blocks
+    # Mifare Classic keys are per sector (4 blocks), so authenticating
+    # once per sector instead of once per block cuts the SPI round-trips
+    # for a full dump by three quarters.
+    current_sector = -1
+    authenticated = False
     for block in range(num_blocks):
         try:
-            if nfc.pn532.mifare_classic_authenticate_block(
-                    uid, block, 0x60, b"\xFF\xFF\xFF\xFF\xFF\xFF"):
+            sector = block // 4
+            if sector != current_sector:
+                current_sector = sector
+                authenticated = nfc.pn532.mifare_classic_authenticate_block(
+                    uid, sector * 4, 0x60, DEFAULT_KEY)
+            if authenticated:
                 data = nfc.pn532.mifare_classic_read_block(block)
                 if data:
-                    blocks_data[block] = {
-                        'hex': bytes(data).hex(),
-                        'base64': base64.b64encode(bytes(data)).decode('utf-8'),
-                        'ascii': ''.join(chr(x) if 32 <= x <= 126 else '.' for x in data)
-                    }
+                    full[block * 16:(block + 1) * 16] = data
+                    read_ok[block] = True
         except Exception as e:
             print(f"Error reading block {block}: {str(e)}")
+            current_sector = -1  # force re-auth after an error
+
+    hex_full = full.hex()
+    ascii_full = full.translate(_ASCII_TABLE).decode('ascii')
+    # base64 stays per block: a 16-byte slice needs its own padding, so
+    # the full-buffer encoding cannot be sliced into per-block strings.
+    view = memoryview(full)
+    blocks_data = {}
+    for block in range(num_blocks):
+        if read_ok[block]:
+            blocks_data[block] = {
+                'hex': hex_full[block * 32:(block + 1) * 32],
+                'base64': base64.b64encode(view[block * 16:(block + 1) * 16]).decode('utf-8'),
+                'ascii': ascii_full[block * 16:(block + 1) * 16]
+            }
     return blocks_data
 
 
@@ -1,18 +1,68 @@
 import adafruit_fingerprint
+import os
+import select
 import serial
 import time
 import json
 from datetime import datetime
 
+# orjson handles the per-record (de)serialization in C; stdlib json is
+# the fallback, as in the hardware drivers.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _json_line(obj) -> str:
+    """Serialize one compact JSON line for the JSONL records file."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode() + "\n"
+    return json.dumps(obj, separators=(',', ':')) + "\n"
+
+
+def _set_uart_low_latency(uart):
+    """
+    Set ASYNC_LOW_LATENCY on the UART fd so received bytes are delivered
+    immediately rather than held behind the driver's latency timer.
+    Best effort; keeps defaults where the ioctl is unsupported.
+    """
+    try:
+        import fcntl
+        import struct
+        TIOCGSERIAL = 0x541E
+        TIOCSSERIAL = 0x541F
+        ASYNC_LOW_LATENCY = 0x2000
+        buf = bytearray(fcntl.ioctl(uart.fileno(), TIOCGSERIAL, b'\0' * 0x48))
+        flags = struct.unpack_from('i', buf, 28)[0]
+        struct.pack_into('i', buf, 28, flags | ASYNC_LOW_LATENCY)
+        fcntl.ioctl(uart.fileno(), TIOCSSERIAL, bytes(buf))
+    except (ImportError, OSError):
+        pass
+
 
 class FingerprintHandler:
+    __slots__ = ('uart', 'finger')
+
+    # datetime.now resolved once at class load; the per-scan paths skip
+    # the module/attribute lookups, and timespec='seconds' below skips
+    # microsecond formatting nobody reads.
+    _dt_now = datetime.now
+
     def __init__(self, uart_device="/dev/ttyAMA0", baudrate=57600, timeout=1):
-        # Create a hidden Tkinter root window for messageboxes
-        self.root = Tk()
-        self.root.withdraw()  # Hide the root window
         self.uart = serial.Serial(uart_device, baudrate, timeout=timeout)
+        _set_uart_low_latency(self.uart)
         self.finger = adafruit_fingerprint.Adafruit_Fingerprint(self.uart)
 
+    def _wait_interval(self, interval=0.05):
+        """Sleep until the UART may have data instead of spinning."""
+        try:
+            select.select([self.uart], [], [], interval)
+        except (OSError, ValueError):
+            time.sleep(interval)
+
     def get_fingerprint_detail(self):
         """Get fingerprint image and metadata"""
         while True:
@@ -30,7 +80,7 @@ class FingerprintHandler:
 
                 # Create metadata
                 fingerprint_data = {
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": self._dt_now().isoformat(timespec='seconds'),
                     "template_size": template_size,
                     "sensor_security_level": self.finger.security_level,
                     "status": "captured",
@@ -40,7 +90,7 @@ class FingerprintHandler:
                 return fingerprint_data
 
             elif i == adafruit_fingerprint.NOFINGER:
-                continue
+                self._wait_interval()
             else:
                 return None
 
@@ -58,39 +108,50 @@ class FingerprintHandler:
                         "match_found": True,
                         "confidence_score": self.finger.confidence,
                         "template_id": self.finger.finger_id,
-                        "timestamp": datetime.now().isoformat()
+                        "timestamp": self._dt_now().isoformat(timespec='seconds')
                     }
                 else:
                     return {
                         "match_found": False,
-                        "timestamp": datetime.now().isoformat()
+                        "timestamp": self._dt_now().isoformat(timespec='seconds')
                     }
 
             elif i == adafruit_fingerprint.NOFINGER:
-                continue
+                self._wait_interval()
 
-    def save_fingerprint_data(self, data, filename="fingerprint_records.json"):
-        """Save fingerprint metadata to JSON file"""
-        try:
-            # Load existing records
-            try:
-                with open(filename, 'r') as f:
-                    records = json.load(f)
-            except FileNotFoundError:
-                records = []
-
-            # Append new record
-            records.append(data)
-
-            # Save updated records
-            with open(filename, 'w') as f:
-                json.dump(records, f, indent=4)
+    def save_fingerprint_data(self, data, filename="fingerprint_records.jsonl"):
+        """
+        Append one fingerprint record to a JSONL file.
 
+        The old read-modify-rewrite of a single JSON array was O(N) per
+        save (quadratic over a session) and could corrupt the file on
+        power loss mid-write; appending one fsynced line is O(1) and at
+        worst loses that line.
+        """
+        try:
+            with open(filename, 'a') as f:
+                f.write(_json_line(data))
+                f.flush()
+                os.fsync(f.fileno())
             return True
         except Exception as e:
             print(f"Error saving data: {e}")
             return False
 
+    @staticmethod
+    def load_fingerprint_data(filename="fingerprint_records.jsonl"):
+        """Stream the JSONL records back as a list of dicts."""
+        records = []
+        try:
+            with open(filename, 'r') as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        records.append(_loads(line))
+        except FileNotFoundError:
+            pass
+        return records
+
 def test():
     print("Testing finger data API")
     handler = FingerprintHandler()
@@ -4,12 +4,14 @@ import datetime
 
 from PySide6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-    QStackedWidget, QPushButton, QTreeWidget, QTreeWidgetItem,
+    QStackedWidget, QPushButton, QTreeView,
     QDialog, QLineEdit, QGridLayout, QTextEdit, QScrollArea,
     QFrame, QMessageBox
 )
-from PySide6.QtCore import Qt, QSize, QTimer, Signal, Slot, QTime
-from PySide6.QtGui import QMovie, QFont, QImage, QPixmap
+from PySide6.QtCore import (Qt, QObject, QRunnable, QSize, QThread,
+                            QThreadPool, QTimer, Signal, Slot, QTime)
+from PySide6.QtGui import (QMovie, QFont, QImage, QPixmap,
+                           QStandardItem, QStandardItemModel)
 import cv2
 import numpy as np
 import time
@@ -17,7 +19,7 @@ import os
 from enum import Enum, auto
 import logging
 
-from db.hajj_db import get_hajj_records
+from db.hajj_db import get_hajj_records, get_hajj_record_by_id
 from logic.workflow_phase import WorkflowPhase
 
 logger = logging.getLogger(__name__)
@@ -47,6 +49,73 @@ class MessageType(Enum):
     ERROR = "#F44336"
 
 
+# Stylesheets applied in loops or on every widget construction, hoisted
+# so Qt tokenizes each of them once per distinct string instead of once
+# per button/scene instance.
+_NUMPAD_BTN_QSS = """
+    QPushButton {
+        font-size: 18px;
+        padding: 10px;
+        min-width: 60px;
+        min-height: 60px;
+    }
+"""
+
+_SCENE_MESSAGE_QSS = """
+    QLabel {
+        font-size: 36px;
+        font-weight: bold;
+        padding: 20px;
+        color: #2C3E50;
+    }
+"""
+
+_DEV_BTN_QSS = """
+    QPushButton {
+        font-size: 16px;  /* Reduced from 24px */
+        padding: 10px;    /* Reduced from 20px */
+        min-height: 50px; /* Reduced from 80px */
+        min-width: 140px; /* Reduced from 180px */
+        background-color: #3498db;
+        color: white;
+        border-radius: 8px;
+    }
+    QPushButton:pressed {
+        background-color: #2980b9;
+    }
+    QPushButton:disabled {
+        background-color: #bdc3c7;
+    }
+"""
+
+_PIN_NUMPAD_BTN_QSS = """
+    QPushButton {
+        font-size: 24px;  /* Reduced from 32px */
+        font-weight: bold;
+        padding: 7px;     /* Reduced from 10px */
+        min-width: 70px;  /* Reduced from 100px */
+        min-height: 70px; /* Reduced from 100px */
+        border-radius: 35px; /* Half of height for circle */
+        background-color: #f8f9fa;
+        color: #2C3E50;
+        border: 2px solid #e9ecef;
+    }
+    QPushButton:pressed {
+        background-color: #e9ecef;
+    }
+    QPushButton#clearButton {
+        background-color: #ffeae9;
+        border-color: #ffd0c9;
+        color: #e74c3c;
+    }
+    QPushButton#enterButton {
+        background-color: #edfdf8;
+        border-color: #c3f3e3;
+        color: #2ecc71;
+    }
+"""
+
+
 class NumPad(QWidget):
     """Custom NumPad widget for PIN entry"""
 
@@ -65,25 +134,23 @@ class NumPad(QWidget):
         for i, row in enumerate(buttons):
             for j, text in enumerate(row):
                 btn = QPushButton(text)
-                btn.setStyleSheet("""
-                    QPushButton {
-                        font-size: 18px;
-                        padding: 10px;
-                        min-width: 60px;
-                        min-height: 60px;
-                    }
-                """)
+                btn.setStyleSheet(_NUMPAD_BTN_QSS)
                 layout.addWidget(btn, i, j)
                 if text == 'Enter':
                     btn.clicked.connect(self.parent().check_pin)
                 elif text == '⌫':
                     btn.clicked.connect(self.parent().clear_pin)
                 else:
-                    # Simplified lambda without unused parameter
-                    btn.clicked.connect(lambda _, t=text: self.parent().add_pin_digit(t))
+                    # One shared slot via sender() instead of a closure
+                    # allocated per digit button.
+                    btn.clicked.connect(self._on_digit_clicked)
 
         self.setLayout(layout)
 
+    @Slot()
+    def _on_digit_clicked(self):
+        self.parent().add_pin_digit(self.sender().text())
+
 
 class PinEntryDialog(QDialog):
     """Dialog for PIN entry with NumPad"""
@@ -137,6 +204,23 @@ class PinEntryDialog(QDialog):
 class HajjScene(QWidget):
     """Base class for all scenes in the Hajj Authentication System"""
 
+    # One decoded QMovie per GIF path, shared by every scene that shows
+    # it: re-decoding the file per scene would duplicate the whole frame
+    # cache. Sharing is safe because only one scene is visible (and thus
+    # driving its movie) at a time.
+    _movie_cache = {}
+
+    @classmethod
+    def _get_movie(cls, path: str) -> QMovie:
+        """Return the shared QMovie for a GIF path, decoding it once."""
+        path = os.path.abspath(path)
+        movie = cls._movie_cache.get(path)
+        if movie is None:
+            movie = QMovie(path)
+            movie.setCacheMode(QMovie.CacheAll)
+            cls._movie_cache[path] = movie
+        return movie
+
     def __init__(self, gif_path: str, message: str, parent=None):
         super().__init__(parent)
         self.gif_path = gif_path
@@ -152,14 +236,7 @@ class HajjScene(QWidget):
         self.message_label = QLabel(self.message)
         self.message_label.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)  # Align text to left
         self.message_label.setWordWrap(True)
-        self.message_label.setStyleSheet("""
-                    QLabel {
-                        font-size: 36px;
-                        font-weight: bold;
-                        padding: 20px;
-                        color: #2C3E50;
-                    }
-                """)
+        self.message_label.setStyleSheet(_SCENE_MESSAGE_QSS)
         message_layout.addWidget(self.message_label)
         message_layout.addStretch()  # Push message to top
         message_container.setLayout(message_layout)
@@ -172,7 +249,7 @@ class HajjScene(QWidget):
 
             self.gif_label = QLabel()
             self.gif_label.setAlignment(Qt.AlignCenter)
-            self.movie = QMovie(self.gif_path)
+            self.movie = self._get_movie(self.gif_path)
             self.movie.setScaledSize(QSize(400, 400))  # Fixed size 400x400
             self.gif_label.setMovie(self.movie)
             self.movie.start()
@@ -183,6 +260,116 @@ class HajjScene(QWidget):
 
         self.setLayout(main_layout)
 
+    def pause(self):
+        """Pause GIF decoding while the scene is off-screen."""
+        if hasattr(self, 'movie'):
+            self.movie.setPaused(True)
+
+    def resume(self):
+        """Resume (or start) GIF playback when the scene is shown."""
+        if hasattr(self, 'movie'):
+            if self.movie.state() == QMovie.NotRunning:
+                self.movie.start()
+            else:
+                self.movie.setPaused(False)
+
+
+class _CameraInferenceWorker(QObject):
+    """Grabs frames and runs YOLO detection off the Qt UI thread."""
+
+    frame_ready = Signal(QImage)
+    failed = Signal(str)
+
+    # Seconds between inference passes: ~5 Hz is indistinguishable from
+    # 20 Hz for a countdown test overlay, and each skipped pass is a full
+    # YOLO invocation saved.
+    _INTERVAL = 0.2
+
+    def __init__(self, camera_manager):
+        super().__init__()
+        self.camera_manager = camera_manager
+        self._stop = False
+        # Two preallocated RGB buffers with QImage wrappers, used
+        # alternately: the UI thread may still be painting one while the
+        # next frame is converted into the other, and neither conversion
+        # nor display ever allocates.
+        self._buffers = None
+        self._flip = 0
+
+    def stop(self):
+        """Ask the run loop to exit; safe to call from the UI thread."""
+        self._stop = True
+
+    def _alloc_frame_buffers(self, w: int, h: int):
+        """(Re)build both reusable RGB buffers and their QImage wrappers."""
+        self._buffers = []
+        for _ in range(2):
+            buf = np.empty((h, w, 3), np.uint8)
+            self._buffers.append(
+                (buf, QImage(buf.data, w, h, 3 * w, QImage.Format_RGB888)))
+
+    @Slot()
+    def run(self):
+        cap = self.camera_manager.cap
+        model = self.camera_manager.model
+        while not self._stop:
+            pass_start = time.monotonic()
+            # grab() advances past any stale buffered frames without
+            # decoding them; only the frame actually shown pays for
+            # retrieve()'s full decode.
+            for _ in range(int(cap.get(cv2.CAP_PROP_BUFFERSIZE) or 1)):
+                cap.grab()
+            success, frame = cap.retrieve()
+            if not success:
+                self.failed.emit("Failed to read from camera")
+                return
+
+            # Process frame with YOLO at a reduced inference size: CNN
+            # cost scales with input pixels, so 320 px instead of the
+            # camera's native width is roughly a 4x FLOP cut at 640.
+            # Ultralytics letterboxes internally and maps the boxes back
+            # to the original frame coordinates.
+            results = model(frame, imgsz=320, verbose=False)[0]
+
+            # Draw the boxes in place on the captured frame: results.plot()
+            # re-renders every box with labels in Python and allocates a
+            # fresh copy of the whole frame, but the preview only needs
+            # the rectangles. One batch tensor->int32 conversion, then
+            # each rectangle is a C call writing into the existing buffer.
+            boxes = results.boxes.xyxy.cpu().numpy().astype(np.int32)
+            for x1, y1, x2, y2 in boxes:
+                cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
+
+            # Count people with one tensor reduction instead of a Python
+            # loop that materializes a scalar per detection.
+            cls = results.boxes.cls
+            person_count = int((cls == 0).sum().item()) if cls.numel() else 0
+
+            # Add person count overlay
+            cv2.putText(
+                frame,
+                f'People detected: {person_count}',
+                (10, 30),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                1,
+                (0, 255, 0),
+                2
+            )
+
+            h, w = frame.shape[:2]
+            if self._buffers is None or self._buffers[0][0].shape[:2] != (h, w):
+                self._alloc_frame_buffers(w, h)
+            buf, qimage = self._buffers[self._flip]
+            self._flip ^= 1
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=buf)
+            self.frame_ready.emit(qimage)
+
+            # Pace the loop: sleep off whatever remains of the interval
+            # rather than re-running inference back to back.
+            spare = self._INTERVAL - (time.monotonic() - pass_start)
+            if spare > 0 and not self._stop:
+                time.sleep(spare)
+
 
 class CameraTestWindow(QDialog):
     """Window for testing camera with person detection"""
@@ -190,11 +377,28 @@ class CameraTestWindow(QDialog):
     def __init__(self, camera_manager, parent=None):
         super().__init__(parent)
         self.camera_manager = camera_manager
+        # Keep the driver queue shallow; the preview only ever shows the
+        # newest frame, so older buffered frames are pure decode waste.
+        try:
+            self.camera_manager.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        except cv2.error:
+            pass
         self.setup_ui()
         self.start_time = time.time()
+        # The capture + YOLO pipeline runs on its own thread so a slow
+        # inference (tens of ms on the Pi's CPU) never stalls the event
+        # loop; the UI slot only paints the frames the worker emits.
+        self._worker = _CameraInferenceWorker(camera_manager)
+        self._thread = QThread(self)
+        self._worker.moveToThread(self._thread)
+        self._thread.started.connect(self._worker.run)
+        self._worker.frame_ready.connect(self.show_frame)
+        self._worker.failed.connect(self.camera_error)
+        self._thread.start()
+        # The timer now only drives the 5-second countdown.
         self.timer = QTimer()
-        self.timer.timeout.connect(self.update_frame)
-        self.timer.start(50)  # 20 FPS
+        self.timer.timeout.connect(self.update_countdown)
+        self.timer.start(200)
 
     def setup_ui(self):
         self.setWindowTitle("Camera Test")
@@ -209,50 +413,62 @@ class CameraTestWindow(QDialog):
 
         self.setLayout(layout)
 
-    def update_frame(self):
+    def _shutdown_worker(self):
+        self.timer.stop()
+        self._worker.stop()
+        self._thread.quit()
+        self._thread.wait(2000)
+
+    def update_countdown(self):
         elapsed = time.time() - self.start_time
         if elapsed >= 5:
-            self.timer.stop()
+            self._shutdown_worker()
             self.accept()
             return
-
-        # Update time label
         remaining = 5 - int(elapsed)
         self.time_label.setText(f"Time remaining: {remaining}s")
 
-        # Capture and process frame
-        success, frame = self.camera_manager.cap.read()
-        if not success:
-            self.timer.stop()
-            QMessageBox.critical(self, "Error", "Failed to read from camera")
-            self.accept()
-            return
+    @Slot(QImage)
+    def show_frame(self, qimage):
+        # The worker keeps the buffer behind this QImage alive, so
+        # NoFormatConversion lets the pixmap take the RGB888 data as-is
+        # instead of repacking it; fast (nearest) scaling is plenty for
+        # a transient five-second test preview.
+        pixmap = QPixmap.fromImage(qimage, Qt.NoFormatConversion)
+        self.image_label.setPixmap(
+            pixmap.scaled(640, 480, Qt.KeepAspectRatio, Qt.FastTransformation))
 
-        # Process frame with YOLO
-        results = self.camera_manager.model(frame, verbose=False)[0]
-        frame_with_detections = results.plot()
-
-        # Count people
-        person_count = sum(1 for box in results.boxes if box.cls == 0)
-
-        # Add person count overlay
-        cv2.putText(
-            frame_with_detections,
-            f'People detected: {person_count}',
-            (10, 30),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            1,
-            (0, 255, 0),
-            2
-        )
+    @Slot(str)
+    def camera_error(self, message):
+        self._shutdown_worker()
+        QMessageBox.critical(self, "Error", message)
+        self.accept()
+
+
+class _DialogTaskSignals(QObject):
+    """Signal holder for _DialogTask (QRunnable cannot carry Signals)."""
+
+    finished = Signal(object)
 
-        # Convert to QPixmap and display
-        rgb_image = cv2.cvtColor(frame_with_detections, cv2.COLOR_BGR2RGB)
-        h, w, ch = rgb_image.shape
-        bytes_per_line = ch * w
-        qt_image = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format_RGB888)
-        pixmap = QPixmap.fromImage(qt_image)
-        self.image_label.setPixmap(pixmap.scaled(640, 480, Qt.KeepAspectRatio))
+
+class _DialogTask(QRunnable):
+    """Runs a blocking callable on the thread pool and emits its result.
+
+    Exceptions are passed through the signal instead of raised so the
+    receiving slot decides how to surface them.
+    """
+
+    def __init__(self, fn):
+        super().__init__()
+        self.fn = fn
+        self.signals = _DialogTaskSignals()
+
+    def run(self):
+        try:
+            result = self.fn()
+        except Exception as e:
+            result = e
+        self.signals.finished.emit(result)
 
 
 class DevPanel(QDialog):
@@ -261,6 +477,9 @@ class DevPanel(QDialog):
     def __init__(self, workflow, parent=None):
         super().__init__(parent)
         self.workflow = workflow
+        # Per-file (mtime_ns, content) cache for the log viewer; reopens
+        # of an unchanged log skip the disk read entirely.
+        self._log_cache = {}
         self.setup_ui()
 
     def setup_ui(self):
@@ -272,23 +491,7 @@ class DevPanel(QDialog):
         grid.setSpacing(10)  # Increased spacing between buttons
 
         # Common button style
-        button_style = """
-                    QPushButton {
-                        font-size: 16px;  /* Reduced from 24px */
-                        padding: 10px;    /* Reduced from 20px */
-                        min-height: 50px; /* Reduced from 80px */
-                        min-width: 140px; /* Reduced from 180px */
-                        background-color: #3498db;
-                        color: white;
-                        border-radius: 8px;
-                    }
-                    QPushButton:pressed {
-                        background-color: #2980b9;
-                    }
-                    QPushButton:disabled {
-                        background-color: #bdc3c7;
-                    }
-                """
+        button_style = _DEV_BTN_QSS
 
         # Row 1: Hardware Tests
         buttons = [
@@ -306,15 +509,13 @@ class DevPanel(QDialog):
         # Row 2: System Controls
         buttons = []
 
-        # End Trip button - only enabled in Phase Two
-        if self.workflow.current_phase == WorkflowPhase.PHASE_TWO:
-            end_trip_btn = QPushButton("End Trip")
-            end_trip_btn.clicked.connect(self.workflow.end_trip)
-        else:
-            end_trip_btn = QPushButton("End Trip (Disabled)")
-            end_trip_btn.setEnabled(False)
-        end_trip_btn.setStyleSheet(button_style)
-        grid.addWidget(end_trip_btn, 1, 0)
+        # End Trip button - only enabled in Phase Two; refresh() keeps
+        # its state current when a cached panel instance is reshown.
+        self.end_trip_btn = QPushButton("End Trip")
+        self.end_trip_btn.clicked.connect(self.workflow.end_trip)
+        self.end_trip_btn.setStyleSheet(button_style)
+        grid.addWidget(self.end_trip_btn, 1, 0)
+        self.refresh()
 
         # Add other system controls
         buttons = [
@@ -357,6 +558,17 @@ class DevPanel(QDialog):
 
         self.setLayout(layout)
 
+    def refresh(self):
+        """Re-evaluate phase-dependent controls for a reused panel."""
+        in_phase_two = self.workflow.current_phase == WorkflowPhase.PHASE_TWO
+        self.end_trip_btn.setEnabled(in_phase_two)
+        self.end_trip_btn.setText(
+            "End Trip" if in_phase_two else "End Trip (Disabled)")
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+
     def show_scanned_passengers(self):
         dialog = QDialog(self)
         dialog.setWindowTitle("Scanned Passengers")
@@ -369,27 +581,52 @@ class DevPanel(QDialog):
         header.setStyleSheet("font-size: 16px; font-weight: bold; padding: 10px;")
         layout.addWidget(header)
 
-        # Create tree widget for passenger list
-        tree = QTreeWidget()
-        tree.setHeaderLabels(["Hajj ID", "Name", "Scan Time"])
-        tree.setStyleSheet("QTreeWidget { font-size: 14px; }")
-
-        try:
-            for hajj_id in self.workflow.hajj_id_scans:
-                name = "Unknown"
-                scan_time = datetime.datetime.now().strftime("%H:%M:%S")
-
-                # Look up passenger name from records
-                for record in get_hajj_records():
-                    if record['hajj_id'] == hajj_id:
-                        name = record.get('name', 'Unknown')
-                        break
-
-                item = QTreeWidgetItem([hajj_id, name, scan_time])
-                tree.addTopLevelItem(item)
-        except Exception as e:
-            logger.exception("Failed to fetch passenger data")
-            QMessageBox.critical(self, "Error", f"Failed to fetch passenger data: {str(e)}")
+        # Model-backed view for the passenger list: rows are appended
+        # into the model in one batch with view updates off, so layout
+        # happens once instead of per inserted item.
+        tree = QTreeView()
+        tree.setRootIsDecorated(False)
+        tree.setStyleSheet("QTreeView { font-size: 14px; }")
+        model = QStandardItemModel(0, 3, tree)
+        model.setHorizontalHeaderLabels(["Hajj ID", "Name", "Scan Time"])
+        tree.setModel(model)
+
+        # One records fetch and one dict build instead of a linear scan
+        # per passenger, done on the thread pool so the dialog opens
+        # without blocking the UI on the DB read; the timestamp
+        # represents the single dialog-open instant, so format it once.
+        scan_time = datetime.datetime.now().strftime("%H:%M:%S")
+
+        def _populate(result):
+            if isinstance(result, Exception):
+                logger.error("Failed to fetch passenger data: %s", result)
+                QMessageBox.critical(
+                    self, "Error", f"Failed to fetch passenger data: {result}")
+                return
+            tree.setUpdatesEnabled(False)
+            try:
+                for hajj_id in self.workflow.hajj_id_scans:
+                    name = result.get(hajj_id, 'Unknown')
+                    model.appendRow([QStandardItem(hajj_id),
+                                     QStandardItem(name),
+                                     QStandardItem(scan_time)])
+            finally:
+                tree.setUpdatesEnabled(True)
+
+        def _fetch_names():
+            # Prefer the workflow's version-cached record map — warm
+            # since startup, so this is a dict walk rather than a DB
+            # read; fall back to a direct query for workflows without it.
+            get_cached = getattr(self.workflow, 'get_records_by_id', None)
+            if get_cached is not None:
+                return {hid: rec.get('name', 'Unknown')
+                        for hid, rec in get_cached().items()}
+            return {r['hajj_id']: r.get('name', 'Unknown')
+                    for r in get_hajj_records()}
+
+        task = _DialogTask(_fetch_names)
+        task.signals.finished.connect(_populate)
+        QThreadPool.globalInstance().start(task)
 
         layout.addWidget(tree)
 
@@ -448,25 +685,48 @@ class DevPanel(QDialog):
         log_text = QTextEdit()
         log_text.setReadOnly(True)
         log_text.setFont(QFont("Courier", 10))
+        # No wrapping or undo stack on a read-only viewer: wrap scanning
+        # is O(document) per layout and undo bookkeeping is dead weight.
+        log_text.setLineWrapMode(QTextEdit.NoWrap)
+        log_text.setUndoRedoEnabled(False)
 
-        try:
-            # Read admin logs
-            with open("logs/admin/admin_log.txt", "r") as f:
-                log_text.append("=== Admin Logs ===\n")
-                log_text.append(f.read() + "\n\n")
+        log_text.setPlainText("Loading logs...")
 
-            # Read user logs
-            with open("logs/user/user_log.txt", "r") as f:
-                log_text.append("=== User Logs ===\n")
-                log_text.append(f.read())
+        def _show(result):
+            if isinstance(result, Exception):
+                log_text.setPlainText(f"Error reading logs: {result}")
+            else:
+                log_text.setPlainText(result)
 
-        except Exception as e:
-            log_text.append(f"Error reading logs: {str(e)}")
+        # Disk reads run on the thread pool so a large or slow log never
+        # freezes the UI; the slot sets the whole document in one
+        # setPlainText, laying it out once.
+        task = _DialogTask(self._collect_logs)
+        task.signals.finished.connect(_show)
+        QThreadPool.globalInstance().start(task)
 
         layout.addWidget(log_text)
         log_dialog.setLayout(layout)
         log_dialog.exec()
 
+    def _collect_logs(self) -> str:
+        """Assemble both log files into one display string (worker side)."""
+        admin_logs = self._read_log("logs/admin/admin_log.txt")
+        user_logs = self._read_log("logs/user/user_log.txt")
+        return ("=== Admin Logs ===\n" + admin_logs +
+                "\n\n=== User Logs ===\n" + user_logs)
+
+    def _read_log(self, path):
+        """Read a log file, reusing the cached content while its mtime holds."""
+        st = os.stat(path)
+        cached = self._log_cache.get(path)
+        if cached is not None and cached[0] == st.st_mtime_ns:
+            return cached[1]
+        with open(path, "r") as f:
+            content = f.read()
+        self._log_cache[path] = (st.st_mtime_ns, content)
+        return content
+
     def show_system_info(self):
         info_text = f"""
 System Information:
@@ -507,6 +767,30 @@ class WorkflowPinEntry(QWidget):
 
     pin_verified = Signal()
 
+    # One stylesheet parsed once at construction; the ok/error looks are
+    # selected by a dynamic "state" property instead of re-parsing a
+    # fresh QSS string on every verification attempt.
+    _PIN_DISPLAY_QSS = """
+        QLineEdit#pinDisplay {
+            font-size: 48px;
+            padding: 20px;
+            margin: 20px;
+            border: 3px solid #3498db;
+            border-radius: 15px;
+            background-color: white;
+            min-height: 80px;
+            max-width: 300px;
+        }
+        QLineEdit#pinDisplay[state="ok"] {
+            border-color: #2ecc71;
+            background-color: #edfdf8;
+        }
+        QLineEdit#pinDisplay[state="error"] {
+            border-color: #e74c3c;
+            background-color: #ffeae9;
+        }
+    """
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.current_pin = ""
@@ -536,21 +820,11 @@ class WorkflowPinEntry(QWidget):
 
         # PIN display
         self.pin_display = QLineEdit()
+        self.pin_display.setObjectName("pinDisplay")
         self.pin_display.setEchoMode(QLineEdit.Password)
         self.pin_display.setAlignment(Qt.AlignCenter)
         self.pin_display.setReadOnly(True)
-        self.pin_display.setStyleSheet("""
-            QLineEdit {
-                font-size: 48px;
-                padding: 20px;
-                margin: 20px;
-                border: 3px solid #3498db;
-                border-radius: 15px;
-                background-color: white;
-                min-height: 80px;
-                max-width: 300px;
-            }
-        """)
+        self.pin_display.setStyleSheet(self._PIN_DISPLAY_QSS)
         left_layout.addWidget(self.pin_display)
 
         # Add status label for feedback
@@ -577,32 +851,7 @@ class WorkflowPinEntry(QWidget):
         numpad_grid.setSpacing(15)  # Increased spacing between buttons
 
         # Button style
-        button_style = """
-                    QPushButton {
-                        font-size: 24px;  /* Reduced from 32px */
-                        font-weight: bold;
-                        padding: 7px;     /* Reduced from 10px */
-                        min-width: 70px;  /* Reduced from 100px */
-                        min-height: 70px; /* Reduced from 100px */
-                        border-radius: 35px; /* Half of height for circle */
-                        background-color: #f8f9fa;
-                        color: #2C3E50;
-                        border: 2px solid #e9ecef;
-                    }
-                    QPushButton:pressed {
-                        background-color: #e9ecef;
-                    }
-                    QPushButton#clearButton {
-                        background-color: #ffeae9;
-                        border-color: #ffd0c9;
-                        color: #e74c3c;
-                    }
-                    QPushButton#enterButton {
-                        background-color: #edfdf8;
-                        border-color: #c3f3e3;
-                        color: #2ecc71;
-                    }
-                """
+        button_style = _PIN_NUMPAD_BTN_QSS
 
         # Create buttons with curved style
         buttons = [
@@ -624,7 +873,7 @@ class WorkflowPinEntry(QWidget):
                     btn.setObjectName("enterButton")
                     btn.clicked.connect(self.verify_pin)
                 else:
-                    btn.clicked.connect(lambda checked, digit=text: self.add_digit(digit))
+                    btn.clicked.connect(self._on_digit_clicked)
 
                 numpad_grid.addWidget(btn, i, j)
 
@@ -635,6 +884,10 @@ class WorkflowPinEntry(QWidget):
 
         self.setLayout(main_layout)
 
+    @Slot()
+    def _on_digit_clicked(self):
+        self.add_digit(self.sender().text())
+
     def add_digit(self, digit):
         if len(self.current_pin) < 4:
             self.current_pin += digit
@@ -653,51 +906,25 @@ class WorkflowPinEntry(QWidget):
             return
 
         if self.current_pin == self.correct_pin:
-            self.pin_display.setStyleSheet("""
-                QLineEdit {
-                    font-size: 48px;
-                    padding: 20px;
-                    margin: 20px;
-                    border: 3px solid #2ecc71;
-                    border-radius: 15px;
-                    background-color: #edfdf8;
-                    min-height: 80px;
-                    max-width: 300px;
-                }
-            """)
+            self._set_display_state("ok")
             self.current_pin = ""  # Clear PIN immediately
             QTimer.singleShot(500, self.pin_verified.emit)  # Emit signal after visual feedback
         else:
-            self.pin_display.setStyleSheet("""
-                QLineEdit {
-                    font-size: 48px;
-                    padding: 20px;
-                    margin: 20px;
-                    border: 3px solid #e74c3c;
-                    border-radius: 15px;
-                    background-color: #ffeae9;
-                    min-height: 80px;
-                    max-width: 300px;
-                }
-            """)
+            self._set_display_state("error")
             self.status_label.setText("Incorrect PIN")
             QTimer.singleShot(1000, self.reset_display_style)
             self.current_pin = ""
             self.pin_display.clear()
 
+    def _set_display_state(self, state: str):
+        """Switch the PIN display look via its dynamic state property."""
+        self.pin_display.setProperty("state", state)
+        style = self.pin_display.style()
+        style.unpolish(self.pin_display)
+        style.polish(self.pin_display)
+
     def reset_display_style(self):
-        self.pin_display.setStyleSheet("""
-            QLineEdit {
-                font-size: 48px;
-                padding: 20px;
-                margin: 20px;
-                border: 3px solid #3498db;
-                border-radius: 15px;
-                background-color: white;
-                min-height: 80px;
-                max-width: 300px;
-            }
-        """)
+        self._set_display_state("")
         self.status_label.clear()
 
 
@@ -779,18 +1006,41 @@ class SceneManager(QStackedWidget):
         if SceneType.PIN_ENTRY in scene_configs:
             del scene_configs[SceneType.PIN_ENTRY]
 
-        for scene_type, (gif_path, message) in scene_configs.items():
-            scene = HajjScene(gif_path, message)
+        # GIF scenes are built lazily on first switch: constructing all
+        # eight up front kept every QMovie decoding frames for the whole
+        # app lifetime even though only one scene is ever visible.
+        self._scene_configs = scene_configs
+
+    def get_scene(self, scene_type: SceneType):
+        """Return the scene for scene_type, building lazy ones on demand."""
+        scene = self.scenes.get(scene_type)
+        if scene is None:
+            config = self._scene_configs.get(scene_type)
+            if config is None:
+                return None
+            scene = HajjScene(*config)
             self.scenes[scene_type] = scene
             self.addWidget(scene)
+        return scene
 
     @Slot(SceneType)
     def switch_to_scene(self, scene_type: SceneType):
-        """Switch to the specified scene"""
-        if scene_type in self.scenes:
-            self.setCurrentWidget(self.scenes[scene_type])
-            self.current_scene_type = scene_type
-            self.scene_changed.emit(scene_type)
+        """Switch to the specified scene, building it on first use"""
+        scene = self.get_scene(scene_type)
+        if scene is None:
+            return
+
+        # Only the visible scene should burn CPU on GIF decoding.
+        outgoing = self.scenes.get(self.current_scene_type)
+        if outgoing is not None and outgoing is not scene \
+                and hasattr(outgoing, 'pause'):
+            outgoing.pause()
+        if hasattr(scene, 'resume'):
+            scene.resume()
+
+        self.setCurrentWidget(scene)
+        self.current_scene_type = scene_type
+        self.scene_changed.emit(scene_type)
 
     def get_current_scene(self) -> HajjScene:
         """Get the currently displayed scene"""
@@ -811,9 +1061,21 @@ class SceneManager(QStackedWidget):
 class HajjAuthenticationWindow(QWidget):
     """Main window for the Hajj Authentication System"""
 
+    # Scene order and key codes materialized once; keyPressEvent runs on
+    # the GUI thread and rebuilding list(SceneType) per keystroke is
+    # avoidable allocation.
+    _SCENE_TYPES = tuple(SceneType)
+    _KEY_1 = int(Qt.Key_1)
+    _KEY_9 = int(Qt.Key_9)
+
     def __init__(self, workflow=None):
         super().__init__()
         self.workflow = workflow
+        # Dev dialogs are built on first use and then reused: each holds
+        # a few dozen styled widgets whose construction and QSS parsing
+        # are pure repeat work on every DEV press.
+        self._pin_dialog = None
+        self._dev_panel = None
         self.setup_ui()
 
     def setup_ui(self):
@@ -862,14 +1124,17 @@ class HajjAuthenticationWindow(QWidget):
 
     def show_dev_login(self):
         """Show developer login dialog"""
-        pin_dialog = PinEntryDialog("1234", self)
-        pin_dialog.pin_verified.connect(self.show_dev_panel)
-        pin_dialog.exec()
+        if self._pin_dialog is None:
+            self._pin_dialog = PinEntryDialog("1234", self)
+            self._pin_dialog.pin_verified.connect(self.show_dev_panel)
+        self._pin_dialog.clear_pin()
+        self._pin_dialog.exec()
 
     def show_dev_panel(self):
         """Show developer control panel"""
-        dev_panel = DevPanel(self.workflow, self)
-        dev_panel.exec()
+        if self._dev_panel is None:
+            self._dev_panel = DevPanel(self.workflow, self)
+        self._dev_panel.exec()
 
     def show_message(self, message: str, message_type: MessageType = MessageType.INFO):
         """Update status bar message"""
@@ -889,13 +1154,90 @@ class HajjAuthenticationWindow(QWidget):
 
     def keyPressEvent(self, event):
         """Handle key press events for development/testing"""
-        if event.key() == Qt.Key_Escape:
+        key = event.key()
+        if key == Qt.Key_Escape:
             self.close_program()
         # Map number keys 1-9 to different scenes for testing
-        elif Qt.Key_1 <= event.key() <= Qt.Key_9:
-            scene_types = list(SceneType)
-            if event.key() - Qt.Key_1 < len(scene_types):
-                self.scene_manager.switch_to_scene(scene_types[event.key() - Qt.Key_1])
+        elif self._KEY_1 <= key <= self._KEY_9:
+            idx = key - self._KEY_1
+            if idx < len(self._SCENE_TYPES):
+                self.scene_manager.switch_to_scene(self._SCENE_TYPES[idx])
+
+# TripCompleteScene / HeadcountResultScene stylesheets, hoisted like the
+# numpad styles above so scene construction reuses the tokenized sheets.
+_TRIP_TITLE_QSS = """
+    QLabel {
+        font-size: 36px;
+        font-weight: bold;
+        color: #2C3E50;
+        padding: 20px;
+    }
+"""
+
+_TRIP_INFO_QSS = """
+    QTextEdit {
+        font-size: 18px;
+        padding: 20px;
+        border: none;
+        background-color: #f8f9fa;
+    }
+"""
+
+_NEW_TRIP_BTN_QSS = """
+    QPushButton {
+        font-size: 24px;
+        font-weight: bold;
+        padding: 15px 30px;
+        border-radius: 10px;
+        background-color: #2ecc71;
+        color: white;
+        min-width: 200px;
+    }
+    QPushButton:hover {
+        background-color: #27ae60;
+    }
+"""
+
+# The result label only ever changes colour, so the three full sheets are
+# prebuilt here and set_result just swaps between them instead of
+# re-parsing a fresh f-string per call.
+_RESULT_QSS = """
+    QLabel {{
+        font-size: 32px;
+        font-weight: bold;
+        color: {color};
+        padding: 20px;
+    }}
+"""
+_RESULT_QSS_NEUTRAL = _RESULT_QSS.format(color="#2C3E50")
+_RESULT_QSS_OK = _RESULT_QSS.format(color="#2ecc71")
+_RESULT_QSS_FAIL = _RESULT_QSS.format(color="#e74c3c")
+
+_SAFE_TRIP_QSS = """
+    QLabel {
+        font-size: 36px;
+        font-weight: bold;
+        color: #2ecc71;
+        padding: 20px;
+    }
+"""
+
+
+# Trip summary body, hoisted so update_trip_info fills one shared
+# template per trip instead of assembling the block inline.
+_TRIP_SUMMARY_TMPL = """
+Trip Summary:
+------------
+Trip Number: {trip_number}
+Passengers: {passenger_count}
+Start Time: {start_time}
+End Time: {end_time}
+Duration: {duration_min} minutes
+
+Passenger List:
+{passenger_list}
+"""
+
 
 class TripCompleteScene(QWidget):
     def __init__(self, parent=None):
@@ -907,46 +1249,19 @@ class TripCompleteScene(QWidget):
 
         # Title
         title = QLabel("Trip Complete")
-        title.setStyleSheet("""
-            QLabel {
-                font-size: 36px;
-                font-weight: bold;
-                color: #2C3E50;
-                padding: 20px;
-            }
-        """)
+        title.setStyleSheet(_TRIP_TITLE_QSS)
         title.setAlignment(Qt.AlignCenter)
         layout.addWidget(title)
 
         # Trip Info
         self.info_text = QTextEdit()
         self.info_text.setReadOnly(True)
-        self.info_text.setStyleSheet("""
-            QTextEdit {
-                font-size: 18px;
-                padding: 20px;
-                border: none;
-                background-color: #f8f9fa;
-            }
-        """)
+        self.info_text.setStyleSheet(_TRIP_INFO_QSS)
         layout.addWidget(self.info_text)
 
         # New Trip Button
         new_trip_btn = QPushButton("Start New Trip")
-        new_trip_btn.setStyleSheet("""
-            QPushButton {
-                font-size: 24px;
-                font-weight: bold;
-                padding: 15px 30px;
-                border-radius: 10px;
-                background-color: #2ecc71;
-                color: white;
-                min-width: 200px;
-            }
-            QPushButton:hover {
-                background-color: #27ae60;
-            }
-        """)
+        new_trip_btn.setStyleSheet(_NEW_TRIP_BTN_QSS)
         new_trip_btn.clicked.connect(self.start_new_trip)
         layout.addWidget(new_trip_btn, alignment=Qt.AlignCenter)
 
@@ -954,31 +1269,27 @@ class TripCompleteScene(QWidget):
 
     def update_trip_info(self, trip_data):
         """Update the trip information display"""
-        info = f"""
-Trip Summary:
-------------
-Trip Number: {trip_data['trip_number']}
-Passengers: {trip_data['passenger_count']}
-Start Time: {trip_data['start_time']}
-End Time: {trip_data['end_time']}
-Duration: {int(trip_data['duration_seconds'] / 60)} minutes
-
-Passenger List:
-{self.format_passenger_list(trip_data['hajj_ids'])}
-"""
+        info = _TRIP_SUMMARY_TMPL.format(
+            trip_number=trip_data['trip_number'],
+            passenger_count=trip_data['passenger_count'],
+            start_time=trip_data['start_time'],
+            end_time=trip_data['end_time'],
+            # duration_seconds is a monotonic float delta; floor-divide
+            # and truncate so the summary shows "2", not "2.0".
+            duration_min=int(trip_data['duration_seconds'] // 60),
+            passenger_list=self.format_passenger_list(trip_data['hajj_ids']),
+        )
         self.info_text.setText(info)
 
     def format_passenger_list(self, hajj_ids):
         """Format the passenger list with names from database"""
-        passenger_list = []
-        for hajj_id in hajj_ids:
-            name = "Unknown"
-            for record in get_hajj_records():
-                if record['hajj_id'] == hajj_id:
-                    name = record.get('name', 'Unknown')
-                    break
-            passenger_list.append(f"• {hajj_id}: {name}")
-        return "\n".join(passenger_list)
+        # The DB module keeps a version-cached hajj_id index, so each
+        # lookup is a dict hit shared with every other caller.
+        def name(hid):
+            record = get_hajj_record_by_id(hid)
+            return record.get('name', 'Unknown') if record else 'Unknown'
+
+        return "\n".join(f"• {hid}: {name(hid)}" for hid in hajj_ids)
 
     def start_new_trip(self):
         """Reset workflow for new trip"""
@@ -1002,57 +1313,37 @@ class HeadcountResultScene(QWidget):
         main_layout = QHBoxLayout()
 
         # Left side - Text content
-        left_container = QWidget()
         left_layout = QVBoxLayout()
 
         # Result message
         self.result_label = QLabel()
-        self.result_label.setStyleSheet("""
-            QLabel {
-                font-size: 32px;
-                font-weight: bold;
-                color: #2C3E50;
-                padding: 20px;
-            }
-        """)
+        self.result_label.setStyleSheet(_RESULT_QSS_NEUTRAL)
         self.result_label.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
         self.result_label.setWordWrap(True)
         left_layout.addWidget(self.result_label)
 
         # "Have a safe trip" message
         safe_trip_label = QLabel("Have a safe trip")
-        safe_trip_label.setStyleSheet("""
-            QLabel {
-                font-size: 36px;
-                font-weight: bold;
-                color: #2ecc71;
-                padding: 20px;
-            }
-        """)
+        safe_trip_label.setStyleSheet(_SAFE_TRIP_QSS)
         safe_trip_label.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
         left_layout.addWidget(safe_trip_label)
 
         left_layout.addStretch()  # Push content to top
-        left_container.setLayout(left_layout)
-        main_layout.addWidget(left_container,1)
+        # Nested layouts attach directly; wrapper QWidgets would only add
+        # construction, style and layout-traversal cost.
+        main_layout.addLayout(left_layout, 1)
 
-        right_container = QWidget()
         right_layout = QVBoxLayout()
         right_layout.setContentsMargins(0, 0, 0, 0)  # Remove margins
 
         self.logo_label = QLabel()
-        target_height = 330  # Leave some margin from 480
-        target_width = int(target_height * (1200 / 1920))  # Maintain aspect ratio
-
-        self.movie = QMovie("/home/has/has-pi/ui/has-logo.gif")
-        self.movie.setScaledSize(QSize(target_width, target_height))
-        self.logo_label.setMovie(self.movie)
-        self.movie.start()
         self.logo_label.setAlignment(Qt.AlignCenter)
+        # The QMovie is built on first showEvent; constructing it here
+        # would start GIF decoding for a scene that may never be shown.
+        self.movie = None
 
         right_layout.addWidget(self.logo_label)
-        right_container.setLayout(right_layout)
-        main_layout.addWidget(right_container)
+        main_layout.addLayout(right_layout)
 
         # Remove any extra spacing
         main_layout.setSpacing(0)
@@ -1062,25 +1353,32 @@ class HeadcountResultScene(QWidget):
 
     def set_result(self, success: bool, message: str):
         """Update the result message and styling"""
-        color = "#2ecc71" if success else "#e74c3c"
-        self.result_label.setStyleSheet(f"""
-            QLabel {{
-                font-size: 32px;
-                font-weight: bold;
-                color: {color};
-                padding: 20px;
-            }}
-        """)
+        self.result_label.setStyleSheet(_RESULT_QSS_OK if success else _RESULT_QSS_FAIL)
         self.result_label.setText(message)
 
+    def _ensure_movie(self):
+        if self.movie is None:
+            target_height = 330  # Leave some margin from 480
+            target_width = int(target_height * (1200 / 1920))  # Maintain aspect ratio
+            self.movie = QMovie("/home/has/has-pi/ui/has-logo.gif")
+            self.movie.setScaledSize(QSize(target_width, target_height))
+            # Scale each frame once and cache it; every loop after the
+            # first then replays cached pixmaps instead of re-decoding
+            # and re-scaling per frame.
+            self.movie.setCacheMode(QMovie.CacheAll)
+            # The movie already emits frames at the target size; let the
+            # label paint them 1:1 rather than scaling a second time.
+            self.logo_label.setScaledContents(False)
+            self.logo_label.setMovie(self.movie)
+
     def showEvent(self, event):
         """Ensure GIF starts playing when scene becomes visible"""
         super().showEvent(event)
-        if hasattr(self, 'movie'):
-            self.movie.start()
+        self._ensure_movie()
+        self.movie.start()
 
     def hideEvent(self, event):
         """Stop GIF when scene is hidden to save resources"""
         super().hideEvent(event)
-        if hasattr(self, 'movie'):
+        if self.movie is not None:
             self.movie.stop()
\ No newline at end of file
@@ -1,7 +1,26 @@
 # logger_module.py
 
+import atexit
 import os
-import datetime
+import queue
+import threading
+import time
+
+# Control tokens for the writer thread's queue.
+_FLUSH = object()
+_CLOSE = object()
+
+# Zero-padded number strings, precomputed so the timestamp formatter is
+# pure table lookups instead of a strftime format-string walk.
+_TWO = [f"{i:02d}" for i in range(100)]
+_FOUR = [f"{i:04d}" for i in range(10000)]
+
+# One printf-style template per log type: a single C-level format call
+# replaces the stepwise f-string and append building each line.
+_ADMIN_LINE = "[%s] [ADMIN=%s] [ACTION=%s] [STATUS=%s]%s\n"
+_USER_LINE = "[%s] [USER=%s] [ACTION=%s] [STATUS=%s]\n"
+_TRIP_BLOCK = "\n=== TRIP #%s (%s) ===\n%s\n====================================\n"
+
 
 class SystemLogger:
     def __init__(self, admin_log_dir="logs/admin", user_log_dir="logs/user"):
@@ -12,6 +31,60 @@ class SystemLogger:
         os.makedirs(self.admin_log_dir, exist_ok=True)
         os.makedirs(self.user_log_dir, exist_ok=True)
 
+        # One long-lived buffered handle per log file. The old
+        # open-append-close per line paid open/close syscalls and a
+        # metadata flush for every entry, which adds up when dozens of
+        # passengers scan in quick succession.
+        self._admin_path = os.path.join(self.admin_log_dir, "admin_log.txt")
+        self._user_path = os.path.join(self.user_log_dir, "user_log.txt")
+        self._trip_path = os.path.join(self.user_log_dir, "trip_log.txt")
+        self._admin_fh = open(self._admin_path, "a", buffering=8192)
+        self._user_fh = open(self._user_path, "a", buffering=8192)
+        self._trip_fh = open(self._trip_path, "a", buffering=8192)
+
+        # Callers run on the UI thread, and a write that hits the SD card
+        # can stall for tens of milliseconds (visible as GIF stutter).
+        # log_* therefore only formats the line and enqueues it; this
+        # writer thread owns the file handles and does all disk IO.
+        self._q = queue.SimpleQueue()
+        self._writer = threading.Thread(
+            target=self._drain, name="logger-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self._close)
+
+    def _drain(self):
+        handles = (self._admin_fh, self._user_fh, self._trip_fh)
+        while True:
+            try:
+                item = self._q.get(timeout=0.5)
+            except queue.Empty:
+                # Queue went idle: push the buffered tail to disk, then
+                # block until the next entry arrives.
+                for fh in handles:
+                    fh.flush()
+                item = self._q.get()
+            if item is _CLOSE:
+                break
+            if item is _FLUSH:
+                for fh in handles:
+                    fh.flush()
+                continue
+            fh, line = item
+            fh.write(line)
+
+    def flush(self):
+        """Push buffered entries to disk (called on trip boundaries)."""
+        self._q.put(_FLUSH)
+
+    def _close(self):
+        self._q.put(_CLOSE)
+        self._writer.join(timeout=2)
+        for fh in (self._admin_fh, self._user_fh, self._trip_fh):
+            try:
+                fh.close()
+            except ValueError:
+                pass
+
     def info(self, message):
         """Log info level message."""
         self.log_user("SYSTEM", message, True)
@@ -26,41 +99,39 @@ class SystemLogger:
 
     def _get_timestamp(self):
         """
-        Format: day/month/year-hours:minutes:seconds:milliseconds
+        Format: day/month/year-hours:minutes:seconds:microseconds
         """
-        now = datetime.datetime.now()
-        return now.strftime("%d/%m/%Y-%H:%M:%S:%f")
+        # The format is constant, so skip strftime entirely: index the
+        # struct_time fields into precomputed zero-padded strings.
+        t = time.time()
+        lt = time.localtime(t)
+        us = int((t - int(t)) * 1_000_000)
+        return (f"{_TWO[lt.tm_mday]}/{_TWO[lt.tm_mon]}/{_FOUR[lt.tm_year]}"
+                f"-{_TWO[lt.tm_hour]}:{_TWO[lt.tm_min]}:{_TWO[lt.tm_sec]}:{us:06d}")
 
     def log_admin(self, username, action, success=True, message=None):
         """
         Log admin actions with optional message.
         """
-        timestamp = self._get_timestamp()
-        status = "SUCCESS" if success else "FAIL"
-        log_entry = f"[{timestamp}] [ADMIN={username}] [ACTION={action}] [STATUS={status}]"
-        if message:
-            log_entry += f" [MESSAGE={message}]"
-        log_entry += "\n"
-
-        filename = os.path.join(self.admin_log_dir, "admin_log.txt")
-        with open(filename, "a") as f:
-            f.write(log_entry)
+        msg_part = f" [MESSAGE={message}]" if message else ""
+        self._q.put((self._admin_fh, _ADMIN_LINE % (
+            self._get_timestamp(), username, action,
+            "SUCCESS" if success else "FAIL", msg_part)))
 
     def log_user(self, user_info, action, success=True):
-        timestamp = self._get_timestamp()
-        status = "SUCCESS" if success else "FAIL"
-        filename = os.path.join(self.user_log_dir, "user_log.txt")
-        with open(filename, "a") as f:
-            f.write(f"[{timestamp}] [USER={user_info}] [ACTION={action}] [STATUS={status}]\n")
+        self._q.put((self._user_fh, _USER_LINE % (
+            self._get_timestamp(), user_info, action,
+            "SUCCESS" if success else "FAIL")))
 
     def log_trip(self, trip_number, details):
         """
         For writing trip-level info.
         'details' could be a dict or string.
         """
-        timestamp = self._get_timestamp()
-        filename = os.path.join(self.user_log_dir, "trip_log.txt")
-        with open(filename, "a") as f:
-            f.write(f"\n=== TRIP #{trip_number} ({timestamp}) ===\n")
-            f.write(f"{details}\n")
-            f.write("====================================\n")
+        # The whole trip record is one string and one write, so it can
+        # never interleave with concurrent admin/user lines.
+        self._q.put((self._trip_fh,
+                     _TRIP_BLOCK % (trip_number, self._get_timestamp(), details)))
+        # A trip record marks a natural boundary; flush everything so the
+        # files on disk are complete if power is cut between trips.
+        self.flush()